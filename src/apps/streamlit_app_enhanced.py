@@ -328,7 +328,7 @@ def main():
             if show_metadata:
                 with st.expander("🛠️ Tool Metadata", expanded=False):
                     tool_info = st.session_state.generator.get_tool_info(selected_tool)
-                    st.json(tool_info)
+                    st.json(dict(tool_info))
             
             # Validation results
             if validate_prompt:
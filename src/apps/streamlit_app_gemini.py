@@ -5,9 +5,9 @@ Description: Interactive web interface for generating optimized Lovable.dev prom
 
 import streamlit as st
 import os
-import yaml
-from src.core.shared_types import TaskContext, ProjectInfo
-from typing import List, Dict, Any
+from src.core.shared_types import TaskContext, ProjectInfo, _bullets
+from src.core import prompt_validation
+from typing import List, Dict, Any, Tuple
 
 # Configure the page
 st.set_page_config(
@@ -18,7 +18,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -53,86 +53,87 @@ st.markdown("""
         color: #92400e;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-def load_tool_profile(config_path: str = "lovable.yaml") -> Dict[str, Any]:
-    """Load the Lovable.dev tool profile configuration"""
+# Widget options
+PRESETS = (
+    "Custom",
+    "E-commerce Store",
+    "SaaS Dashboard",
+    "Blog Platform",
+    "Mobile App",
+    "Portfolio Site"
+)
+
+TECH_OPTIONS = (
+    "Next.js", "React", "Vue.js", "Angular", "Svelte",
+    "TypeScript", "JavaScript", "Python", "Node.js",
+    "Tailwind CSS", "Material-UI", "Chakra UI", "Ant Design",
+    "Prisma", "Supabase", "Firebase", "MongoDB", "PostgreSQL"
+)
+DEFAULT_TECH_STACK = ("Next.js", "React", "Tailwind CSS")
+
+TASK_TYPES = (
+    "build complete application",
+    "create responsive dashboard",
+    "implement authentication",
+    "add payment integration",
+    "optimize performance",
+    "enhance accessibility",
+    "debug and refactor"
+)
+
+DEFAULT_TOOL_PROFILE = {
+    'tool_name': 'Lovable.dev',
+    'format': 'markdown',
+    'tone': 'official yet casual'
+}
+
+@st.cache_data(show_spinner=False)
+def _load_tool_profile_cached(config_path: str, mtime: float) -> Tuple[Dict[str, Any], bool]:
+    """Parse the tool profile; mtime is only part of the cache key so edits invalidate it"""
+    import yaml  # Deferred: only needed on a cache miss
+    
     try:
         with open(config_path, 'r', encoding='utf-8') as file:
-            return yaml.safe_load(file)
+            return yaml.safe_load(file), True
     except FileNotFoundError:
+        return dict(DEFAULT_TOOL_PROFILE), False
+
+def load_tool_profile(config_path: str = "lovable.yaml") -> Dict[str, Any]:
+    """Load the Lovable.dev tool profile configuration"""
+    try:
+        mtime = os.path.getmtime(config_path)
+    except OSError:
+        mtime = 0.0
+    
+    profile, found = _load_tool_profile_cached(config_path, mtime)
+    if not found:
         st.warning(f"Configuration file {config_path} not found. Using default settings.")
-        return {
-            'tool_name': 'Lovable.dev',
-            'format': 'markdown',
-            'tone': 'official yet casual'
-        }
+    return profile
+
+@st.cache_resource(show_spinner=False)
+def get_rag_generator():
+    """Build the Gemini RAG generator once and share it across reruns and sessions"""
+    from build_prompt_gemini import LovablePromptGeneratorGemini
+    return LovablePromptGeneratorGemini()
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def validate_prompt(prompt: str) -> Dict[str, Any]:
-    """Validate the generated prompt for completeness"""
-    validation_results = {
-        'is_valid': True,
-        'score': 0,
-        'issues': [],
-        'suggestions': []
-    }
-    
-    # Check for key components
-    required_sections = ['context', 'requirements', 'technical', 'ui']
-    score = 0
-    
-    for section in required_sections:
-        if section.lower() in prompt.lower():
-            score += 25
-        else:
-            validation_results['issues'].append(f"Missing {section} section")
-    
-    # Check prompt length
-    if len(prompt) < 200:
-        validation_results['issues'].append("Prompt is too short")
-        score -= 10
-    elif len(prompt) > 2000:
-        validation_results['issues'].append("Prompt might be too long")
-        score -= 5
-    
-    # Check for specificity
-    vague_words = ['nice', 'good', 'better', 'improve', 'enhance']
-    vague_count = sum(1 for word in vague_words if word in prompt.lower())
-    if vague_count > 3:
-        validation_results['issues'].append("Prompt contains vague language")
-        score -= 10
-    
-    validation_results['score'] = max(0, min(100, score))
-    validation_results['is_valid'] = validation_results['score'] >= 60
-    
-    if not validation_results['is_valid']:
-        validation_results['suggestions'] = [
-            "Be more specific about requirements",
-            "Include technical stack details",
-            "Add UI/UX specifications",
-            "Define success criteria"
-        ]
-    
-    return validation_results
+    """Validate the generated prompt for completeness; keyed on the prompt text so reruns skip the scan"""
+    return prompt_validation.validate_prompt(prompt)
 
-def generate_simple_prompt(task_context: TaskContext, project_info: ProjectInfo) -> str:
-    """Generate a prompt using template-based approach for demo purposes"""
-    
-    tech_stack = ', '.join(project_info.tech_stack)
-    tech_reqs = '\n'.join(f"- {req}" for req in task_context.technical_requirements)
-    ui_reqs = '\n'.join(f"- {req}" for req in task_context.ui_requirements)
-    constraints = '\n'.join(f"- {constraint}" for constraint in task_context.constraints)
-    
-    prompt = f"""# {task_context.task_type.title()} for {project_info.name}
+# Template prompt layout; placeholders are filled by _generate_simple_prompt_cached via format_map
+_PROMPT_TEMPLATE = """# {task_title} for {project_name}
 
 ## Project Overview
-{project_info.description}
+{project_description}
 
-**Target Audience:** {project_info.target_audience}
+**Target Audience:** {target_audience}
 **Technology Stack:** {tech_stack}
 
 ## Task Description
-{task_context.description}
+{task_description}
 
 ## Technical Requirements
 {tech_reqs}
@@ -163,11 +164,47 @@ Create a modern, responsive web application that follows Lovable.dev best practi
 
 Please implement this step by step, ensuring each component is thoroughly tested before moving to the next."""
 
-    return prompt
+@st.cache_data(show_spinner=False)
+def _generate_simple_prompt_cached(task_type: str, task_description: str, technical_requirements: Tuple[str, ...],
+                                   ui_requirements: Tuple[str, ...], constraints: Tuple[str, ...], project_name: str,
+                                   project_description: str, tech_stack: Tuple[str, ...], target_audience: str) -> str:
+    """Render the template prompt from hashable primitives so identical inputs hit the cache"""
+    return _PROMPT_TEMPLATE.format_map({
+        'task_title': task_type.title(),
+        'project_name': project_name,
+        'project_description': project_description,
+        'target_audience': target_audience,
+        'tech_stack': ', '.join(tech_stack),
+        'task_description': task_description,
+        'tech_reqs': _bullets(technical_requirements),
+        'ui_reqs': _bullets(ui_requirements),
+        'constraints': _bullets(constraints)
+    })
+
+def generate_simple_prompt(task_context: TaskContext, project_info: ProjectInfo) -> str:
+    """Generate a prompt using template-based approach for demo purposes"""
+    return _generate_simple_prompt_cached(
+        task_context.task_type,
+        task_context.description,
+        task_context.technical_requirements,
+        task_context.ui_requirements,
+        task_context.constraints,
+        project_info.name,
+        project_info.description,
+        project_info.tech_stack,
+        project_info.target_audience
+    )
+
+def _parse_lines(text: str) -> Tuple[str, ...]:
+    """Split a text area into its non-blank lines, stripping each line once"""
+    return tuple(line for line in map(str.strip, text.splitlines()) if line)
 
 def main():
     """Main Streamlit application"""
     
+    # Streamlit only keeps elements emitted during the current run, so the styles are sent every rerun
+    st.markdown(_CSS, unsafe_allow_html=True)
+    
     # Header
     st.markdown('<h1 class="main-header">🚀 Lovable.dev Prompt Generator</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Powered by Google Gemini RAG | Generate optimized development prompts</p>', unsafe_allow_html=True)
@@ -181,7 +218,8 @@ def main():
         
         # API Status Check
         gemini_api_key = os.getenv('GOOGLE_API_KEY', '')
-        if gemini_api_key and gemini_api_key != 'your-google-api-key-here':
+        api_configured = bool(gemini_api_key) and gemini_api_key != 'your-google-api-key-here'
+        if api_configured:
             st.success("✅ Google Gemini API configured")
             rag_enabled = st.checkbox("Use RAG retrieval", value=True, help="Enable semantic search for context")
         else:
@@ -191,7 +229,11 @@ def main():
         
         # Vector Database Status
         chroma_path = "chroma_lovable_gemini"
-        if os.path.exists(chroma_path):
+        if 'chroma_ready' not in st.session_state:
+            st.session_state.chroma_ready = os.path.exists(chroma_path)
+        chroma_ready = st.session_state.chroma_ready
+        
+        if chroma_ready:
             st.success("✅ Vector database ready")
         else:
             st.warning("📚 Vector database not found")
@@ -199,19 +241,18 @@ def main():
                 with st.spinner("Creating vector database..."):
                     # This would run the database creation
                     st.info("Run: `python create_lovable_database_gemini.py`")
+            if st.button("🔄 Recheck Vector Database"):
+                del st.session_state.chroma_ready
+                st.rerun()
+        
+        # Only attempt the RAG generator when it can actually run
+        use_rag = api_configured and rag_enabled and chroma_ready
         
         st.divider()
         
         # Quick presets
         st.subheader("🎯 Quick Presets")
-        preset = st.selectbox("Choose a preset:", [
-            "Custom",
-            "E-commerce Store",
-            "SaaS Dashboard", 
-            "Blog Platform",
-            "Mobile App",
-            "Portfolio Site"
-        ])
+        preset = st.selectbox("Choose a preset:", PRESETS)
         
         if preset != "Custom":
             st.info(f"Using {preset} preset template")
@@ -233,25 +274,11 @@ def main():
             target_audience = st.text_input("Target Audience", value="General users")
             
             # Technology Stack
-            tech_options = [
-                "Next.js", "React", "Vue.js", "Angular", "Svelte",
-                "TypeScript", "JavaScript", "Python", "Node.js",
-                "Tailwind CSS", "Material-UI", "Chakra UI", "Ant Design",
-                "Prisma", "Supabase", "Firebase", "MongoDB", "PostgreSQL"
-            ]
-            tech_stack = st.multiselect("Technology Stack", tech_options, default=["Next.js", "React", "Tailwind CSS"])
+            tech_stack = st.multiselect("Technology Stack", TECH_OPTIONS, default=DEFAULT_TECH_STACK)
         
         # Task Configuration
         with st.expander("🎯 Task Configuration", expanded=True):
-            task_type = st.selectbox("Task Type", [
-                "build complete application",
-                "create responsive dashboard", 
-                "implement authentication",
-                "add payment integration",
-                "optimize performance",
-                "enhance accessibility",
-                "debug and refactor"
-            ])
+            task_type = st.selectbox("Task Type", TASK_TYPES)
             
             task_description = st.text_area(
                 "Task Description", 
@@ -263,15 +290,15 @@ def main():
         with st.expander("📋 Requirements", expanded=True):
             st.subheader("Technical Requirements")
             tech_req_input = st.text_area("Enter requirements (one per line)", height=100)
-            tech_requirements = [req.strip() for req in tech_req_input.split('\n') if req.strip()]
+            tech_requirements = _parse_lines(tech_req_input)
             
             st.subheader("UI/UX Requirements")
             ui_req_input = st.text_area("Enter UI requirements (one per line)", height=100)
-            ui_requirements = [req.strip() for req in ui_req_input.split('\n') if req.strip()]
+            ui_requirements = _parse_lines(ui_req_input)
             
             st.subheader("Constraints")
             constraints_input = st.text_area("Enter constraints (one per line)", height=100)
-            constraints = [constraint.strip() for constraint in constraints_input.split('\n') if constraint.strip()]
+            constraints = _parse_lines(constraints_input)
 
     with col2:
         st.header("🚀 Generated Prompt")
@@ -294,17 +321,16 @@ def main():
                 description=project_description,
                 tech_stack=tech_stack,
                 target_audience=target_audience,
-                requirements=[]
+                requirements=()
             )
             
             # Generate prompt
             with st.spinner("Generating optimized prompt..."):
                 try:
-                    if rag_enabled and os.path.exists(chroma_path):
+                    if use_rag:
                         # Try to use full RAG system
                         try:
-                            from build_prompt_gemini import LovablePromptGeneratorGemini
-                            generator = LovablePromptGeneratorGemini()
+                            generator = get_rag_generator()
                             generated_prompt = generator.generate_prompt(task_context, project_info)
                         except Exception as e:
                             st.warning(f"RAG system unavailable: {e}")
@@ -322,10 +348,11 @@ def main():
                     st.session_state.generated_prompt = None
         
         # Display generated prompt
-        if hasattr(st.session_state, 'generated_prompt') and st.session_state.generated_prompt:
+        generated_prompt = st.session_state.get('generated_prompt')
+        if generated_prompt:
             
             # Validation
-            validation = validate_prompt(st.session_state.generated_prompt)
+            validation = validate_prompt(generated_prompt)
             
             # Validation metrics
             col_score, col_status = st.columns(2)
@@ -348,23 +375,19 @@ def main():
             
             # Prompt display
             st.subheader("📄 Generated Prompt")
-            st.text_area(
-                "Copy this prompt to Lovable.dev:",
-                value=st.session_state.generated_prompt,
-                height=400,
-                key="prompt_display"
-            )
+            st.caption("Copy this prompt to Lovable.dev:")
+            st.code(generated_prompt, language='markdown')
             
             # Export options
             col_copy, col_download = st.columns(2)
             with col_copy:
                 if st.button("📋 Copy to Clipboard", use_container_width=True):
-                    st.info("Prompt copied! (Use Ctrl+C to copy from text area)")
+                    st.toast("Use the copy icon in the top-right corner of the prompt")
             
             with col_download:
                 st.download_button(
                     label="💾 Download as .md",
-                    data=st.session_state.generated_prompt,
+                    data=generated_prompt,
                     file_name=f"{project_name.lower().replace(' ', '_')}_prompt.md",
                     mime="text/markdown",
                     use_container_width=True
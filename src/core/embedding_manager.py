@@ -28,9 +28,15 @@ except ImportError:
     print("Google Generative AI not installed. Please run: pip install langchain-google-genai")
     GoogleGenerativeAIEmbeddings = None
 
+try:
+    from langchain_community.embeddings import InfinityEmbeddings
+except ImportError:
+    InfinityEmbeddings = None
+
 class EmbeddingProvider(Enum):
     """Supported embedding providers"""
     GOOGLE_GEMINI = "google_gemini"
+    INFINITY = "infinity"
 
 @dataclass
 class EmbeddingConfig:
@@ -40,6 +46,7 @@ class EmbeddingConfig:
     api_key: Optional[str] = None
     batch_size: int = 100
     task_type: str = "retrieval_document"
+    api_url: Optional[str] = None  # Inference server URL (Infinity only)
 
 @dataclass 
 class ChromaDBConfig:
@@ -83,8 +90,11 @@ class ChromaEmbeddingManager:
         if chromadb is None:
             raise ImportError("ChromaDB not available. Please install: pip install chromadb")
             
-        # Validate Gemini availability
-        if GoogleGenerativeAIEmbeddings is None:
+        # Validate provider availability
+        if embedding_config.provider == EmbeddingProvider.INFINITY:
+            if InfinityEmbeddings is None:
+                raise ImportError("Infinity embeddings not available. Please install: pip install langchain-community")
+        elif GoogleGenerativeAIEmbeddings is None:
             raise ImportError("Google Generative AI not available. Please install: pip install langchain-google-genai")
     
     @classmethod
@@ -97,6 +107,16 @@ class ChromaEmbeddingManager:
             task_type="retrieval_document"
         )
     
+    @classmethod
+    def get_default_infinity_config(cls) -> EmbeddingConfig:
+        """Get default configuration for a local Infinity inference server"""
+        return EmbeddingConfig(
+            provider=EmbeddingProvider.INFINITY,
+            model_name=os.getenv("INFINITY_MODEL", "BAAI/bge-small-en-v1.5"),
+            api_url=os.getenv("INFINITY_API_URL", "http://localhost:7997"),
+            batch_size=64
+        )
+    
     def get_embedding_model(self):
         """
         Get the configured embedding model
@@ -105,7 +125,10 @@ class ChromaEmbeddingManager:
             Embedding model instance
         """
         if self._embedding_model is None:
-            self._embedding_model = self._create_gemini_embeddings()
+            if self.embedding_config.provider == EmbeddingProvider.INFINITY:
+                self._embedding_model = self._create_infinity_embeddings()
+            else:
+                self._embedding_model = self._create_gemini_embeddings()
         
         return self._embedding_model
     
@@ -187,6 +210,16 @@ class ChromaEmbeddingManager:
             task_type=self.embedding_config.task_type
         )
     
+    def _create_infinity_embeddings(self):
+        """Create embeddings backed by an Infinity inference server (dynamic batching, fp16)"""
+        if InfinityEmbeddings is None:
+            raise ImportError("InfinityEmbeddings not available")
+        
+        return InfinityEmbeddings(
+            model=self.embedding_config.model_name,
+            infinity_api_url=self.embedding_config.api_url
+        )
+    
     def add_documents(self, 
                      documents: List[str],
                      metadatas: Optional[List[Dict[str, Union[str, int, float, bool]]]] = None,
@@ -304,21 +337,26 @@ class ChromaEmbeddingManager:
 
 def create_chroma_embedding_manager(model_name: Optional[str] = None,
                                    collection_name: Optional[str] = None,
-                                   persist_directory: Optional[str] = None) -> ChromaEmbeddingManager:
+                                   persist_directory: Optional[str] = None,
+                                   provider: str = "google_gemini") -> ChromaEmbeddingManager:
     """
     Convenience function to create ChromaDB embedding manager
     
     Args:
-        model_name: Optional Gemini model name override
+        model_name: Optional embedding model name override
         collection_name: Optional collection name override
         persist_directory: Optional persist directory override
+        provider: "google_gemini" or "infinity"
         
     Returns:
         ChromaEmbeddingManager instance
     """
     
     # Create embedding config
-    embedding_config = ChromaEmbeddingManager.get_default_gemini_config()
+    if provider == EmbeddingProvider.INFINITY.value:
+        embedding_config = ChromaEmbeddingManager.get_default_infinity_config()
+    else:
+        embedding_config = ChromaEmbeddingManager.get_default_gemini_config()
     if model_name:
         embedding_config.model_name = model_name
     
@@ -339,17 +377,19 @@ def create_embedding_manager(provider: str = "google_gemini",
     Backward compatibility function
     
     Args:
-        provider: Only "google_gemini" is supported now
+        provider: "google_gemini", or "infinity" for a self-hosted Infinity server
+            (configured via INFINITY_API_URL / INFINITY_MODEL)
         model_name: Optional model name override
         
     Returns:
         ChromaEmbeddingManager instance
     """
     
-    if provider != "google_gemini":
-        raise ValueError(f"Only 'google_gemini' provider is supported, got: {provider}")
+    supported = [p.value for p in EmbeddingProvider]
+    if provider not in supported:
+        raise ValueError(f"Provider must be one of {supported}, got: {provider}")
     
-    return create_chroma_embedding_manager(model_name=model_name)
+    return create_chroma_embedding_manager(model_name=model_name, provider=provider)
 
 
 # Example usage and testing
@@ -0,0 +1,80 @@
+"""
+Prompt Validation
+Keyword scans and completeness scoring shared by the prompt generators and apps
+"""
+
+import re
+from typing import Any, Dict, Iterable, Set, Tuple
+
+# Lovable prompt keywords, matched as case-insensitive substrings
+REQUIRED_SECTIONS = ('context', 'requirements', 'technical', 'ui')
+VAGUE_WORDS = ('nice', 'good', 'better', 'improve', 'enhance')
+
+VALIDATION_SUGGESTIONS = (
+    "Be more specific about requirements",
+    "Include technical stack details",
+    "Add UI/UX specifications",
+    "Define success criteria"
+)
+
+def keyword_pattern(keywords: Iterable[str] = (), ignorecase_keywords: Iterable[str] = ()) -> re.Pattern:
+    """
+    Compile one regex that finds every keyword occurrence in a single pass
+    
+    Each alternative sits inside a lookahead, so hits inside longer words and
+    overlapping hits (such as "ui" in "requirements") are all reported.
+    `keywords` match case-sensitively, `ignorecase_keywords` in any case.
+    """
+    alternatives = [re.escape(keyword) for keyword in keywords]
+    ignorecase = [re.escape(keyword) for keyword in ignorecase_keywords]
+    if ignorecase:
+        alternatives.append("(?i:" + "|".join(ignorecase) + ")")
+    return re.compile("(?=(" + "|".join(alternatives) + "))")
+
+def find_keywords(pattern: re.Pattern, text: str) -> Set[str]:
+    """Keywords of a keyword_pattern found in the text, as they appear there"""
+    return set(pattern.findall(text))
+
+_LOVABLE_KEYWORD_RE = keyword_pattern(ignorecase_keywords=REQUIRED_SECTIONS + VAGUE_WORDS)
+
+def score_prompt(prompt: str) -> Tuple[int, Tuple[str, ...]]:
+    """Score a Lovable prompt for completeness (0-100) and list its issues"""
+    found = {keyword.lower() for keyword in find_keywords(_LOVABLE_KEYWORD_RE, prompt)}
+    issues = []
+    
+    # Check for key components
+    score = 0
+    
+    for section in REQUIRED_SECTIONS:
+        if section in found:
+            score += 25
+        else:
+            issues.append(f"Missing {section} section")
+    
+    # Check prompt length
+    if len(prompt) < 200:
+        issues.append("Prompt is too short")
+        score -= 10
+    elif len(prompt) > 2000:
+        issues.append("Prompt might be too long")
+        score -= 5
+    
+    # Check for specificity
+    vague_count = sum(1 for word in VAGUE_WORDS if word in found)
+    if vague_count > 3:
+        issues.append("Prompt contains vague language")
+        score -= 10
+    
+    return max(0, min(100, score)), tuple(issues)
+
+def validate_prompt(prompt: str) -> Dict[str, Any]:
+    """Validate a generated Lovable prompt for completeness"""
+    score, issues = score_prompt(prompt)
+    is_valid = score >= 60
+    
+    return {
+        'is_valid': is_valid,
+        'score': score,
+        'issues': list(issues),
+        'suggestions': [] if is_valid else list(VALIDATION_SUGGESTIONS)
+    }
@@ -4,23 +4,38 @@ Description: Common data structures used across all modules
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import Tuple
 
-@dataclass
+def _freeze_lists(instance, *names: str):
+    """Store the named list fields as tuples so a frozen dataclass stays hashable"""
+    for name in names:
+        object.__setattr__(instance, name, tuple(getattr(instance, name)))
+
+def _bullets(items) -> str:
+    """Render strings as a markdown bullet list (empty string for no items)"""
+    return "\n".join(f"- {item}" for item in items)
+
+@dataclass(frozen=True)
 class TaskContext:
     """Context for a specific task type"""
     task_type: str
     project_name: str
     description: str
-    technical_requirements: List[str]
-    ui_requirements: List[str]
-    constraints: List[str]
+    technical_requirements: Tuple[str, ...]
+    ui_requirements: Tuple[str, ...]
+    constraints: Tuple[str, ...]
+    
+    def __post_init__(self):
+        _freeze_lists(self, 'technical_requirements', 'ui_requirements', 'constraints')
 
-@dataclass
+@dataclass(frozen=True)
 class ProjectInfo:
     """Project information structure"""
     name: str
     description: str
-    tech_stack: List[str]
+    tech_stack: Tuple[str, ...]
     target_audience: str
-    requirements: List[str]
+    requirements: Tuple[str, ...]
+    
+    def __post_init__(self):
+        _freeze_lists(self, 'tech_stack', 'requirements')
@@ -0,0 +1,100 @@
+"""
+Text Splitting
+Recursive splitter with split-then-merge passes shared by the tool generators
+"""
+
+import re
+import functools
+from typing import List
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+@functools.lru_cache(maxsize=None)
+def _token_encoding():
+    """Load the tiktoken encoding once, or None when it is unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+def _count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, falling back to a ~4 chars/token estimate"""
+    encoding = _token_encoding()
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+class SplitThenMergeSplitter(RecursiveCharacterTextSplitter):
+    """Recursive splitter that re-splits oversized chunks and merges tiny ones"""
+    
+    _SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+    
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200,
+                 max_chunk_size: int = 1100, min_chunk_tokens: int = 100, **kwargs):
+        kwargs.setdefault('separators', ["\n\n", "\n", ". ", " ", ""])
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap, **kwargs)
+        self.target_chunk_size = chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.min_chunk_tokens = min_chunk_tokens
+    
+    def split_text(self, text: str) -> List[str]:
+        # Passes 1-2: recursive split and greedy merge with overlap (base splitter)
+        chunks = super().split_text(text)
+        
+        # Pass 3: re-split anything above 1.05x the ceiling on sentence boundaries
+        limit = int(self.max_chunk_size * 1.05)
+        sized = []
+        for chunk in chunks:
+            if len(chunk) > limit:
+                sized.extend(self._split_oversized(chunk))
+            else:
+                sized.append(chunk)
+        
+        # Pass 4: fold chunks under the token floor into their next sibling
+        merged = []
+        pending = ""
+        for chunk in sized:
+            if pending:
+                if len(pending) + len(chunk) + 1 <= self.max_chunk_size:
+                    chunk = f"{pending}\n{chunk}"
+                else:
+                    merged.append(pending)
+                pending = ""
+            if _count_tokens(chunk) < self.min_chunk_tokens:
+                pending = chunk
+            else:
+                merged.append(chunk)
+        if pending:
+            if merged and len(merged[-1]) + len(pending) + 1 <= self.max_chunk_size:
+                merged[-1] = f"{merged[-1]}\n{pending}"
+            else:
+                merged.append(pending)
+        
+        return merged
+    
+    def _split_oversized(self, chunk: str) -> List[str]:
+        """Pack sentences up to chunk_size, hard-cutting any single oversized sentence"""
+        pieces = []
+        current = ""
+        for sentence in self._SENTENCE_RE.split(chunk):
+            while len(sentence) > self.max_chunk_size:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(sentence[:self.target_chunk_size])
+                sentence = sentence[self.target_chunk_size:]
+            if current and len(current) + len(sentence) + 1 > self.target_chunk_size:
+                pieces.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            pieces.append(current)
+        return pieces
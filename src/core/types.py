@@ -61,7 +61,7 @@ class FlowConnection:
     animation: Optional[str] = None
     conditions: Optional[List[str]] = None
 
-@dataclass
+@dataclass(slots=True)
 class TaskContext:
     """Enhanced context for a specific task type"""
     task_type: str
@@ -89,7 +89,7 @@ class ProjectInfo:
     industry: Optional[str] = None
     complexity_level: Literal["simple", "medium", "complex"] = "medium"
     
-@dataclass
+@dataclass(slots=True)
 class PromptingStrategy:
     """Prompting strategy configuration"""
     strategy_type: Literal["structured", "conversational", "meta", "reverse_meta", "iterative", "parallel", "planning_mode", "production_ready", "security_first"]
@@ -100,7 +100,7 @@ class PromptingStrategy:
     requires_confirmation: bool = False  # For tools that wait for user confirmation
     security_focused: bool = False  # For tools with security-first approaches
 
-@dataclass
+@dataclass(slots=True)
 class ToolProfile:
     """Tool-specific configuration profile"""
     tool_name: str
@@ -117,7 +117,7 @@ class ToolProfile:
     optimization_tips: List[str]
     common_pitfalls: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class PromptResult:
     """Generated prompt result with metadata"""
     prompt: str
@@ -130,3 +130,18 @@ class PromptResult:
     enhancement_suggestions: Optional[List[str]] = None
     applied_strategy: Optional[str] = None
     tool_specific_optimizations: Optional[List[str]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form for API boundaries, with enums replaced by their values"""
+        return {
+            "prompt": self.prompt,
+            "stage": self.stage.value,
+            "tool": self.tool.value,
+            "confidence_score": self.confidence_score,
+            "sources": self.sources,
+            "next_suggested_stage": self.next_suggested_stage.value if self.next_suggested_stage else None,
+            "regeneration_context": self.regeneration_context,
+            "enhancement_suggestions": self.enhancement_suggestions,
+            "applied_strategy": self.applied_strategy,
+            "tool_specific_optimizations": self.tool_specific_optimizations
+        }
@@ -0,0 +1,176 @@
+"""
+Vector Store Backends
+FAISS-backed alternative to ChromaDB for build-once / query-many workloads
+"""
+
+import os
+import json
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Suffix of the docstore written next to each .index file
+DOCSTORE_SUFFIX = ".docs.json"
+
+class VectorStoreBackend(Enum):
+    """Supported vector store backends"""
+    CHROMA = "chroma"
+    FAISS = "faiss"
+
+class FaissBackend:
+    """Single FAISS HNSW index plus a JSON docstore, persisted as two files
+    
+    Vectors are L2-normalized and searched by inner product, and scores are
+    reported as cosine distances (lower is closer) to match Chroma's
+    "hnsw:space": "cosine" collections. By default vectors are stored as
+    8-bit scalar-quantized codes (IndexHNSWSQ, 4x smaller than float32).
+    The quantizer's per-dimension ranges are trained once, on the first
+    batch added, and are not retrained: later vectors outside those ranges
+    are clipped. An index built from the whole corpus in one add gets
+    representative ranges; pass quantize=False for an index that mostly
+    grows through later adds.
+    
+    add() only updates memory; call save() once a batch of adds is done.
+    Saved indexes are memory-mapped read-only on load and only read fully
+    into memory on the first add.
+    """
+    
+    def __init__(self, index_path: str, hnsw_m: int = 32, ef_construction: int = 200, ef_search: int = 48,
+                 quantize: bool = True):
+        """
+        Open the index at index_path if it exists, otherwise start an empty one
+        
+        Args:
+            index_path: Path of the .index file; the docstore sits next to it (.docs.json)
+            hnsw_m: HNSW graph degree
+            ef_construction: HNSW candidate list size while building
+            ef_search: HNSW candidate list size at query time
+            quantize: Store int8 scalar-quantized vectors instead of float32
+        """
+        if faiss is None:
+            raise ImportError("FAISS not available. Please install: pip install faiss-cpu")
+        
+        self.index_path = Path(index_path)
+        self.docstore_path = self.index_path.with_suffix(DOCSTORE_SUFFIX)
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.quantize = quantize
+        
+        self.index = None
+        self._lock = threading.Lock()  # HNSW graphs are not safe to search while growing
+        self._read_only = False
+        self._texts: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        
+        if self.index_path.exists() and self.docstore_path.exists():
+            self._load()
+    
+    def __len__(self) -> int:
+        return len(self._texts)
+    
+    @staticmethod
+    def is_saved(index_path) -> bool:
+        """Whether a complete index (index file and JSON docstore) was saved at index_path"""
+        index_path = Path(index_path)
+        return index_path.exists() and index_path.with_suffix(DOCSTORE_SUFFIX).exists()
+    
+    def _load(self):
+        """Memory-map the saved index and load its docstore"""
+        self.index = faiss.read_index(str(self.index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        self._read_only = True
+        self._apply_search_params()
+        
+        with open(self.docstore_path, 'r', encoding='utf-8') as f:
+            docstore = json.load(f)
+        self._texts = docstore['texts']
+        self._metadatas = docstore['metadatas']
+    
+    def _new_index(self, dim: int):
+        """Create an empty HNSW index for dim-dimensional vectors"""
+        if self.quantize:
+            index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = self.ef_construction
+        return index
+    
+    def _apply_search_params(self):
+        """Set the query-time candidate list size on the (possibly reloaded) index"""
+        faiss.downcast_index(self.index).hnsw.efSearch = self.ef_search
+    
+    @staticmethod
+    def _as_matrix(embeddings) -> np.ndarray:
+        """Stack embeddings into a contiguous, L2-normalized float32 matrix"""
+        matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        faiss.normalize_L2(matrix)
+        return matrix
+    
+    def add(self, embeddings: List[List[float]], documents: List[str], metadatas: List[Dict[str, Any]]):
+        """Add embedded documents to the index (in memory; call save() to persist them)"""
+        if not documents:
+            return
+        
+        vectors = self._as_matrix(embeddings)
+        with self._lock:
+            if self.index is None:
+                self.index = self._new_index(vectors.shape[1])
+                self._apply_search_params()
+                if not self.index.is_trained:
+                    # Quantizer ranges come from this first batch only (see class docstring)
+                    self.index.train(vectors)
+            elif self._read_only:
+                # A memory-mapped index cannot grow; read it fully before adding
+                self.index = faiss.read_index(str(self.index_path))
+                self._read_only = False
+                self._apply_search_params()
+            
+            self.index.add(vectors)
+            self._texts.extend(documents)
+            self._metadatas.extend(dict(metadata) for metadata in metadatas)
+    
+    def save(self):
+        """Write the index and docstore, replacing the old files atomically"""
+        with self._lock:
+            if self.index is None or self._read_only:
+                # Nothing added since the index was created or loaded
+                return
+            
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            tmp_index = self.index_path.with_suffix(".index.tmp")
+            faiss.write_index(self.index, str(tmp_index))
+            os.replace(tmp_index, self.index_path)
+            
+            tmp_docstore = self.docstore_path.with_suffix(".tmp")
+            with open(tmp_docstore, 'w', encoding='utf-8') as f:
+                json.dump({'texts': self._texts, 'metadatas': self._metadatas}, f, ensure_ascii=False)
+            os.replace(tmp_docstore, self.docstore_path)
+    
+    def similarity_search_by_vector_with_relevance_scores(self, embedding: List[float], k: int = 4) -> List[Tuple[Document, float]]:
+        """Return the k nearest documents with their cosine distances"""
+        query = self._as_matrix(embedding)
+        with self._lock:
+            if self.index is None or not self._texts:
+                return []
+            similarities, ids = self.index.search(query, min(k, len(self._texts)))
+        return [
+            (Document(page_content=self._texts[i], metadata=self._metadatas[i]), 1.0 - float(similarity))
+            for similarity, i in zip(similarities[0], ids[0])
+            if i >= 0
+        ]
+    
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4) -> List[Document]:
+        """Return the k nearest documents"""
+        return [doc for doc, _ in self.similarity_search_by_vector_with_relevance_scores(embedding, k=k)]
@@ -7,6 +7,7 @@ Description: Multi-stage prompt generator supporting various AI development tool
 import os
 import yaml
 import json
+from dataclasses import asdict
 from typing import Dict, List, Optional, Any, Tuple
 from src.core.types import (
     TaskContext, ProjectInfo, ToolProfile, PromptResult,
@@ -261,7 +262,7 @@ class MultiToolPromptGenerator:
                 sources=[doc.metadata.get('source', 'unknown') for doc in context_docs],
                 next_suggested_stage=next_stage,
                 regeneration_context={
-                    'task_context': task_context.__dict__,
+                    'task_context': asdict(task_context),
                     'project_info': project_info.__dict__,
                     'used_template': template_name,
                     'context_count': len(context_docs)
@@ -402,7 +403,7 @@ Please implement this using {tool_profile.tool_name} following the {tool_profile
             next_suggested_stage=self._suggest_next_stage(stage, task_context),
             regeneration_context={
                 'fallback': True,
-                'task_context': task_context.__dict__,
+                'task_context': asdict(task_context),
                 'project_info': project_info.__dict__
             }
         )
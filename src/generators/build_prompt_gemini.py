@@ -9,6 +9,7 @@ import yaml
 import json
 from typing import Dict, List, Optional, Any
 from src.core.shared_types import TaskContext, ProjectInfo
+from src.core.prompt_validation import validate_prompt
 from jinja2 import Template, Environment, FileSystemLoader
 from langchain_community.document_loaders import DirectoryLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -285,50 +286,7 @@ Ensure clean code, proper error handling, and excellent user experience.
     
     def validate_prompt(self, prompt: str) -> Dict[str, Any]:
         """Validate the generated prompt for completeness"""
-        validation_results = {
-            'is_valid': True,
-            'score': 0,
-            'issues': [],
-            'suggestions': []
-        }
-        
-        # Check for key components
-        required_sections = ['context', 'requirements', 'technical', 'ui']
-        score = 0
-        
-        for section in required_sections:
-            if section.lower() in prompt.lower():
-                score += 25
-            else:
-                validation_results['issues'].append(f"Missing {section} section")
-        
-        # Check prompt length
-        if len(prompt) < 200:
-            validation_results['issues'].append("Prompt is too short")
-            score -= 10
-        elif len(prompt) > 2000:
-            validation_results['issues'].append("Prompt might be too long")
-            score -= 5
-        
-        # Check for specificity
-        vague_words = ['nice', 'good', 'better', 'improve', 'enhance']
-        vague_count = sum(1 for word in vague_words if word in prompt.lower())
-        if vague_count > 3:
-            validation_results['issues'].append("Prompt contains vague language")
-            score -= 10
-        
-        validation_results['score'] = max(0, min(100, score))
-        validation_results['is_valid'] = validation_results['score'] >= 60
-        
-        if not validation_results['is_valid']:
-            validation_results['suggestions'] = [
-                "Be more specific about requirements",
-                "Include technical stack details",
-                "Add UI/UX specifications",
-                "Define success criteria"
-            ]
-        
-        return validation_results
+        return validate_prompt(prompt)
 
 
 def main():
@@ -4,26 +4,117 @@ Incorporates best practices from Lovable.dev, Bolt.new, and other AI development
 """
 
 import os
+import re
+import json
+import functools
+import threading
 import yaml
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from enum import Enum
 import chromadb
-from typing import Dict, List, Optional, Any, Tuple
+from chromadb.utils import embedding_functions
+from typing import Dict, List, Optional, Any, Tuple, Mapping
 from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from src.core.shared_types import _bullets
 from src.core.types import (
     PromptStage, SupportedTool, TaskContext, PromptResult, 
     ToolProfile, PromptingStrategy, AppStructure, PageSpec, FlowConnection
 )
 
+# Stage lookup tables used on every generate_enhanced_prompt call
+_STAGE_NEXT = {
+    PromptStage.APP_SKELETON: PromptStage.PAGE_UI,
+    PromptStage.PAGE_UI: PromptStage.FLOW_CONNECTIONS,
+    PromptStage.FLOW_CONNECTIONS: PromptStage.FEATURE_SPECIFIC,
+    PromptStage.FEATURE_SPECIFIC: PromptStage.OPTIMIZATION
+}
+_STRUCTURED_STAGES = frozenset({PromptStage.APP_SKELETON})
+
+_BOLT_ARCHITECTURE_SECTION = """
+
+Architecture Requirements:
+- Modern web application structure
+- Component-based organization
+- Proper state management
+- Responsive design implementation
+- Performance optimization"""
+
+_BOLT_ENHANCE_PREFIX = "[Note: Consider using the Enhance Prompt feature ⭐ for this request]\n\n"
+
+# Words of a requirement ("Mobile-responsive," -> "mobile", "responsive")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Serializes the first build of the class-wide profile/strategy tables
+_PROFILE_LOCK = threading.Lock()
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode enums by value (matching orjson) and anything else as a string"""
+    return obj.value if isinstance(obj, Enum) else str(obj)
+
+
 class EnhancedMultiToolGenerator:
     """Enhanced prompt generator with advanced strategies and tool-specific optimizations"""
     
     def __init__(self, data_directory: str = "data", chroma_directory: str = "chroma_gemini"):
         self.data_dir = Path(data_directory)
-        self.chroma_client = chromadb.PersistentClient(path=chroma_directory)
-        self.tool_profiles = self._load_tool_profiles()
-        self.prompting_strategies = self._load_prompting_strategies()
+        self._chroma_dir = chroma_directory
+        self._chroma_client = None
+        self._embedding_function = None
+        self._embed_query = functools.lru_cache(maxsize=4096)(self._compute_query_embedding)
+        with _PROFILE_LOCK:
+            self.tool_profiles = self._load_tool_profiles()
+            self.prompting_strategies = self._load_prompting_strategies()
+        
+        # Base prompt builders specialized per (tool, stage); unlisted pairs use the generic builder
+        self._prompt_fns = {}
+        for stage in PromptStage:
+            skeleton = stage == PromptStage.APP_SKELETON
+            self._prompt_fns[(SupportedTool.LOVABLE, stage)] = (
+                self._generate_lovable_skeleton_prompt if skeleton
+                else self._generate_lovable_conversational_prompt
+            )
+            self._prompt_fns[(SupportedTool.BOLT, stage)] = (
+                self._generate_bolt_skeleton_prompt if skeleton
+                else self._generate_bolt_prompt
+            )
         
-    def _load_tool_profiles(self) -> Dict[str, ToolProfile]:
-        """Load enhanced tool profiles with prompting strategies"""
+        # Tool-specific optimizers; other tools are returned unchanged
+        self._optimizers = {
+            SupportedTool.LOVABLE: self._optimize_lovable_prompt,
+            SupportedTool.BOLT: self._optimize_bolt_prompt
+        }
+    
+    def _get_chroma_client(self):
+        """ChromaDB client, opened on first use so meta prompts never touch the DB"""
+        if self._chroma_client is None:
+            self._chroma_client = chromadb.PersistentClient(path=self._chroma_dir)
+        return self._chroma_client
+    
+    @property
+    def chroma_client(self):
+        """ChromaDB client (see _get_chroma_client)"""
+        return self._get_chroma_client()
+    
+    def _compute_query_embedding(self, text: str) -> Tuple[float, ...]:
+        """Embed a query with the collections' default encoder (memoized via _embed_query)"""
+        if self._embedding_function is None:
+            self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        return tuple(float(x) for x in self._embedding_function([text])[0])
+        
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _load_tool_profiles(cls) -> Mapping[str, ToolProfile]:
+        """Load enhanced tool profiles with prompting strategies (built once and shared; never mutate them)"""
         profiles = {}
         
         # Lovable profile with C.L.E.A.R. framework
@@ -141,11 +232,13 @@ class EnhancedMultiToolGenerator:
             ]
         )
         
-        return profiles
+        return MappingProxyType(profiles)
     
-    def _load_prompting_strategies(self) -> Dict[str, List[PromptingStrategy]]:
-        """Load advanced prompting strategies"""
-        return {
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _load_prompting_strategies(cls) -> Mapping[str, List[PromptingStrategy]]:
+        """Load advanced prompting strategies (built once, shared read-only)"""
+        return MappingProxyType({
             "meta_prompting": [
                 PromptingStrategy(
                     strategy_type="meta",
@@ -162,7 +255,7 @@ class EnhancedMultiToolGenerator:
                     effectiveness_score=0.8
                 )
             ]
-        }
+        })
     
     def generate_enhanced_prompt(
         self,
@@ -178,14 +271,15 @@ class EnhancedMultiToolGenerator:
             raise ValueError(f"Unsupported tool: {context.target_tool}")
         
         # Retrieve relevant context from vector database
-        collection = self.chroma_client.get_or_create_collection(
+        collection = self._get_chroma_client().get_or_create_collection(
             name=tool_profile.vector_namespace
         )
         
-        # Query for relevant examples and documentation
+        # Query for relevant examples and documentation; repeated queries reuse the cached embedding
+        query_text = f"{context.task_type} {context.description}"
         query_results = collection.query(
-            query_texts=[f"{context.task_type} {context.description}"],
-            n_results=5
+            query_embeddings=[list(self._embed_query(query_text))],
+            n_results=self._choose_k(context)
         )
         
         # Determine optimal prompting strategy
@@ -219,23 +313,68 @@ class EnhancedMultiToolGenerator:
             stage=context.stage,
             tool=context.target_tool,
             confidence_score=confidence,
-            sources=[doc for doc in query_results['documents'][0]] if query_results['documents'] else [],
+            sources=query_results['documents'][0] if query_results.get('documents') else [],
             next_suggested_stage=next_stage,
             enhancement_suggestions=enhancement_suggestions,
             applied_strategy=strategy,
-            tool_specific_optimizations=tool_profile.optimization_tips
+            # Profiles are shared by every call, so hand out a copy of the list
+            tool_specific_optimizations=list(tool_profile.optimization_tips)
         )
     
+    def generate_enhanced_prompt_json(
+        self,
+        context: TaskContext,
+        strategy: str = "auto",
+        include_optimizations: bool = True
+    ) -> bytes:
+        """Generate an enhanced prompt and return it JSON-encoded, ready for a web response"""
+        result = self.generate_enhanced_prompt(context, strategy, include_optimizations)
+        
+        # orjson encodes the dataclass and its enums directly, skipping the intermediate dict;
+        # the default covers anything else it cannot serialize natively
+        if orjson is not None:
+            return orjson.dumps(result, default=_json_default)
+        return json.dumps(result.to_dict(), default=_json_default).encode("utf-8")
+    
+    def generate_for_tools(
+        self,
+        base_context: TaskContext,
+        tools: List[SupportedTool],
+        strategy: str = "auto",
+        include_optimizations: bool = True
+    ) -> Dict[SupportedTool, PromptResult]:
+        """Generate prompts for several tools concurrently, overlapping the blocking Chroma queries"""
+        if not tools:
+            return {}
+        
+        # Open the client up front so worker threads don't race to create it
+        self._get_chroma_client()
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(tools))) as executor:
+            futures = {
+                executor.submit(
+                    self.generate_enhanced_prompt,
+                    replace(base_context, target_tool=tool),
+                    strategy,
+                    include_optimizations
+                ): tool
+                for tool in tools
+            }
+            return {futures[future]: future.result() for future in as_completed(futures)}
+    
+    def _choose_k(self, context: TaskContext) -> int:
+        """Pick how many documents to retrieve based on how much the query says"""
+        if len(context.description) < 40:
+            return 3
+        if context.stage == PromptStage.APP_SKELETON:
+            return 7
+        return 5
+    
     def _determine_optimal_strategy(self, context: TaskContext, profile: ToolProfile) -> str:
         """Determine the best prompting strategy based on context"""
-        if context.stage == PromptStage.APP_SKELETON:
-            return "structured"
-        elif len(context.technical_requirements) > 5:
+        if context.stage in _STRUCTURED_STAGES or len(context.technical_requirements) > 5:
             return "structured"
-        elif context.stage in [PromptStage.DEBUGGING, PromptStage.OPTIMIZATION]:
-            return "conversational"
-        else:
-            return "conversational"
+        return "conversational"
     
     def _generate_base_prompt(
         self,
@@ -244,20 +383,14 @@ class EnhancedMultiToolGenerator:
         query_results: Dict
     ) -> str:
         """Generate base prompt using tool-specific templates"""
-        
-        if profile.tool_name == "Lovable.dev":
-            return self._generate_lovable_prompt(context, query_results)
-        elif profile.tool_name == "Bolt.new":
-            return self._generate_bolt_prompt(context, query_results)
-        else:
-            return self._generate_generic_prompt(context, query_results)
+        generate = self._prompt_fns.get(
+            (context.target_tool, context.stage), self._generate_generic_prompt
+        )
+        return generate(context, query_results)
     
-    def _generate_lovable_prompt(self, context: TaskContext, query_results: Dict) -> str:
-        """Generate Lovable-optimized prompt using C.L.E.A.R. framework"""
-        
-        # Structured format for complex tasks
-        if context.stage == PromptStage.APP_SKELETON:
-            return f"""Context: You are building a {context.project_name} using Lovable with React, TypeScript, and Supabase.
+    def _generate_lovable_skeleton_prompt(self, context: TaskContext, query_results: Dict) -> str:
+        """Generate Lovable-optimized prompt using C.L.E.A.R. framework (structured, for app skeletons)"""
+        return f"""Context: You are building a {context.project_name} using Lovable with React, TypeScript, and Supabase.
 
 Task: {context.description}
 
@@ -269,56 +402,47 @@ Guidelines:
 - Use shadcn/ui components for consistent UI
 
 Technical Requirements:
-{chr(10).join(f"- {req}" for req in context.technical_requirements)}
+{_bullets(context.technical_requirements)}
 
 UI Requirements:
-{chr(10).join(f"- {req}" for req in context.ui_requirements)}
+{_bullets(context.ui_requirements)}
 
 Constraints:
-{chr(10).join(f"- {constraint}" for constraint in context.constraints)}
+{_bullets(context.constraints)}
 
 Before starting, please confirm you understand the project requirements from the Knowledge Base."""
-        
-        else:
-            # Conversational format for incremental development
-            return f"""Let's {context.task_type.lower().replace('_', ' ')} for the {context.project_name} project.
+    
+    def _generate_lovable_conversational_prompt(self, context: TaskContext, query_results: Dict) -> str:
+        """Generate Lovable prompt in conversational format for incremental development"""
+        all_reqs = (*context.technical_requirements, *context.ui_requirements)
+        return f"""Let's {context.task_type.lower().replace('_', ' ')} for the {context.project_name} project.
 
 {context.description}
 
 Requirements:
-{chr(10).join(f"- {req}" for req in context.technical_requirements + context.ui_requirements)}
+{_bullets(all_reqs)}
 
 Please ensure the implementation maintains consistency with existing components and follows our established patterns."""
     
     def _generate_bolt_prompt(self, context: TaskContext, query_results: Dict) -> str:
         """Generate Bolt.new optimized prompt for enhancement feature"""
-        
-        base_description = f"""Create a {context.task_type.lower().replace('_', ' ')} for {context.project_name}.
+        return f"""Create a {context.task_type.lower().replace('_', ' ')} for {context.project_name}.
 
 Core Functionality:
 {context.description}
 
 Technical Specifications:
-{chr(10).join(f"- {req}" for req in context.technical_requirements)}
+{_bullets(context.technical_requirements)}
 
 UI/UX Requirements:
-{chr(10).join(f"- {req}" for req in context.ui_requirements)}
+{_bullets(context.ui_requirements)}
 
 Constraints:
-{chr(10).join(f"- {constraint}" for constraint in context.constraints)}"""
-
-        # Add stage-specific details
-        if context.stage == PromptStage.APP_SKELETON:
-            base_description += f"""
-
-Architecture Requirements:
-- Modern web application structure
-- Component-based organization
-- Proper state management
-- Responsive design implementation
-- Performance optimization"""
-        
-        return base_description
+{_bullets(context.constraints)}"""
+    
+    def _generate_bolt_skeleton_prompt(self, context: TaskContext, query_results: Dict) -> str:
+        """Generate Bolt.new prompt with architecture requirements for app skeletons"""
+        return self._generate_bolt_prompt(context, query_results) + _BOLT_ARCHITECTURE_SECTION
     
     def _generate_generic_prompt(self, context: TaskContext, query_results: Dict) -> str:
         """Generate generic prompt for other tools"""
@@ -328,13 +452,13 @@ Task: {context.task_type.replace('_', ' ').title()}
 Description: {context.description}
 
 Technical Requirements:
-{chr(10).join(f"- {req}" for req in context.technical_requirements)}
+{_bullets(context.technical_requirements)}
 
 UI Requirements:
-{chr(10).join(f"- {req}" for req in context.ui_requirements)}
+{_bullets(context.ui_requirements)}
 
 Constraints:
-{chr(10).join(f"- {constraint}" for constraint in context.constraints)}
+{_bullets(context.constraints)}
 
 Please implement this feature following best practices for {context.target_tool.value}."""
     
@@ -345,25 +469,32 @@ Please implement this feature following best practices for {context.target_tool.
         profile: ToolProfile
     ) -> str:
         """Apply tool-specific optimizations"""
+        optimize = self._optimizers.get(context.target_tool)
+        if optimize is None:
+            return base_prompt
+        return optimize(base_prompt, context)
+    
+    def _optimize_lovable_prompt(self, base_prompt: str, context: TaskContext) -> str:
+        """Lovable-specific optimizations"""
+        parts = [base_prompt]
         
-        optimized = base_prompt
+        if context.stage == PromptStage.DEBUGGING:
+            parts.append("\n\nPlease use Chat mode to discuss the issue before implementing changes.")
         
-        # Lovable-specific optimizations
-        if profile.tool_name == "Lovable.dev":
-            if context.stage == PromptStage.DEBUGGING:
-                optimized += "\n\nPlease use Chat mode to discuss the issue before implementing changes."
-            
-            if "responsive" in context.ui_requirements:
-                optimized += "\n\nEnsure mobile-first responsive design using Tailwind breakpoints (sm:, md:, lg:)."
+        ui_words = {word for req in context.ui_requirements for word in _WORD_RE.findall(req.lower())}
+        if "responsive" in ui_words:
+            parts.append("\n\nEnsure mobile-first responsive design using Tailwind breakpoints (sm:, md:, lg:).")
+        
+        return "".join(parts)
+    
+    def _optimize_bolt_prompt(self, base_prompt: str, context: TaskContext) -> str:
+        """Bolt.new specific optimizations"""
+        parts = [_BOLT_ENHANCE_PREFIX, base_prompt]
         
-        # Bolt.new specific optimizations
-        elif profile.tool_name == "Bolt.new":
-            optimized = f"[Note: Consider using the Enhance Prompt feature ⭐ for this request]\n\n{optimized}"
-            
-            if len(context.technical_requirements) > 3:
-                optimized += "\n\nSuggestion: Break this into smaller, incremental changes for better results."
+        if len(context.technical_requirements) > 3:
+            parts.append("\n\nSuggestion: Break this into smaller, incremental changes for better results.")
         
-        return optimized
+        return "".join(parts)
     
     def _calculate_confidence_score(
         self,
@@ -372,11 +503,12 @@ Please implement this feature following best practices for {context.target_tool.
         profile: ToolProfile
     ) -> float:
         """Calculate confidence score for the generated prompt"""
-        score = 0.5  # Base score
-        
-        # Boost for relevant documentation
-        if query_results.get('documents') and query_results['documents'][0]:
-            score += 0.2
+        # Base score weighted by how close the retrieved documents are to the query
+        distances = np.asarray((query_results.get('distances') or [[]])[0], dtype=np.float32)
+        if distances.size:
+            score = 0.3 + 0.4 * float((1.0 / (1.0 + distances)).mean())
+        else:
+            score = 0.3
         
         # Boost for complete requirements
         if context.technical_requirements and context.ui_requirements:
@@ -402,23 +534,17 @@ Please implement this feature following best practices for {context.target_tool.
         if not context.constraints:
             suggestions.append("Define constraints to avoid scope creep")
         
-        if profile.tool_name == "Lovable.dev" and context.stage == PromptStage.APP_SKELETON:
+        if context.target_tool == SupportedTool.LOVABLE and context.stage == PromptStage.APP_SKELETON:
             suggestions.append("Consider setting up Knowledge Base with project requirements")
         
-        if profile.tool_name == "Bolt.new":
+        if context.target_tool == SupportedTool.BOLT:
             suggestions.append("Use the enhance prompt feature for more detailed specifications")
         
         return suggestions
     
     def _suggest_next_stage(self, context: TaskContext) -> Optional[PromptStage]:
         """Suggest the next logical development stage"""
-        stage_progression = {
-            PromptStage.APP_SKELETON: PromptStage.PAGE_UI,
-            PromptStage.PAGE_UI: PromptStage.FLOW_CONNECTIONS,
-            PromptStage.FLOW_CONNECTIONS: PromptStage.FEATURE_SPECIFIC,
-            PromptStage.FEATURE_SPECIFIC: PromptStage.OPTIMIZATION
-        }
-        return stage_progression.get(context.stage)
+        return _STAGE_NEXT.get(context.stage)
     
     def generate_meta_prompt(self, original_prompt: str, context: TaskContext) -> str:
         """Generate meta prompt for prompt improvement"""
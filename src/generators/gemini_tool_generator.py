@@ -4,26 +4,129 @@ Supports multiple no-code/low-code tools with RAG-powered documentation retrieva
 """
 
 import os
+import copy
 import yaml
 import json
+import uuid
+import asyncio
+import functools
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 import glob
 
 from langchain_community.document_loaders import DirectoryLoader, TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 from langchain_community.vectorstores import Chroma
 from dotenv import load_dotenv
+import chromadb
 
-# Import our new embedding manager
-import sys
-sys.path.append(str(Path(__file__).parent.parent))
-from core.embedding_manager import create_embedding_manager, EmbeddingProvider
+from src.core.embedding_manager import create_embedding_manager, EmbeddingProvider
+from src.core.vector_backend import VectorStoreBackend, FaissBackend
+from src.core.text_splitter import SplitThenMergeSplitter
+from src.core.shared_types import _freeze_lists
+
+# libyaml's C loader when available (several times faster than the pure-Python one)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 load_dotenv()
 
+# One collection per tool ("docs_<tool>"); chunks without a tool go to the default one
+TOOL_COLLECTION_PREFIX = "docs_"
+DEFAULT_TOOL_KEY = "_default"
+
+# Collection used by stores created before the per-tool layout (LangChain's default name)
+LEGACY_COLLECTION_NAME = "langchain"
+
+# HNSW parameters applied when the collection is first created. Chroma persists
+# every add itself; sync_threshold coalesces HNSW index flushes to disk
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:construction_ef": 200,
+    "hnsw:M": 32,
+    "hnsw:batch_size": 10000,
+    "hnsw:sync_threshold": 20000
+}
+
+# Maximum records per collection.add call (below SQLite's variable limit)
+ADD_BATCH_SIZE = 5000
+
+# Background ingestion: chunks per embedding batch and max wait to fill one (seconds)
+INGEST_BATCH_SIZE = 512
+INGEST_BATCH_TIMEOUT = 1.0
+
+# Longest wait for queued chunks when a generator is closed or the interpreter exits (seconds)
+INGEST_CLOSE_TIMEOUT = 30.0
+
+# Bullet formatter for requirement lists
+_REQ_FMT = "- {}".format
+
+# Strategy flag -> bullet, in the order they appear in the prompt
+BULLET_MAP = {
+    "step_by_step": "- Break down the task into clear, actionable steps",
+    "context_first": "- Provide full context before implementation details",
+    "examples": "- Include relevant examples and code snippets",
+    "incremental": "- Focus on incremental improvements and iterations"
+}
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    """Read a whole file, or None if it cannot be read"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError as e:
+        print(f"Error reading {path}: {e}")
+        return None
+
+def _drain_ingest_queue(ingest_q: "queue.Queue", timeout: float) -> bool:
+    """Wait up to timeout seconds for every queued chunk to be processed; False if some are left"""
+    deadline = time.monotonic() + timeout
+    with ingest_q.all_tasks_done:
+        while ingest_q.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            ingest_q.all_tasks_done.wait(remaining)
+    return True
+
+def _stop_ingest_worker(ingest_q: "queue.Queue", timeout: float):
+    """Finish queued writes (bounded by timeout) and tell the worker to exit"""
+    if not _drain_ingest_queue(ingest_q, timeout):
+        print(f"Warning: Dropping {ingest_q.unfinished_tasks} queued document chunks after {timeout:.0f}s")
+    try:
+        ingest_q.put_nowait(None)
+    except queue.Full:
+        pass
+
+@functools.lru_cache(maxsize=8)
+def _load_tool_configs_cached(signature: Tuple[Tuple[str, int], ...]) -> Dict[str, Dict[str, Any]]:
+    """
+    Read all tool YAML files up front, then parse them; the mtimes in the key invalidate edited files
+    
+    The result is shared between callers, so copy it before handing it out.
+    """
+    if not signature:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=min(16, len(signature))) as executor:
+        buffers = list(executor.map(_read_bytes, [path for path, _ in signature]))
+    
+    raw_configs = {}
+    for (path, _), data in zip(signature, buffers):
+        if data is None:
+            continue
+        tool_name = Path(path).stem
+        try:
+            raw_configs[tool_name] = yaml.load(data, Loader=_YamlLoader)
+        except Exception as e:
+            print(f"Error loading config for {tool_name}: {e}")
+    return raw_configs
+
 @dataclass
 class ToolConfig:
     """Configuration for a specific tool"""
@@ -35,8 +138,35 @@ class ToolConfig:
     strategies: Dict[str, Any]
     stages: List[str]
     components: List[str]
+    # Prompt sections that only depend on the config, rendered once
+    _strategy_section: str = field(default="", init=False, repr=False, compare=False)
+    _output_format: str = field(default="", init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        strategy_bullets = [bullet for key, bullet in BULLET_MAP.items() if self.strategies.get(key)]
+        strategy_text = "\n".join(strategy_bullets) if strategy_bullets else "- Follow standard development practices"
+        
+        self._strategy_section = f"""## Implementation Strategy
 
-@dataclass
+{strategy_text}
+
+**Tone**: {self.tone}
+**Supported Components**: {", ".join(self.components)}"""
+        
+        self._output_format = f"""## Expected Output
+
+Please provide a {self.format} response that includes:
+
+1. **Implementation Plan**: Step-by-step approach
+2. **Code Structure**: File organization and architecture
+3. **Key Components**: Main features and functionality
+4. **Integration Points**: How components work together
+5. **Testing Strategy**: Validation and quality assurance
+6. **Next Steps**: Immediate actions to take
+
+Format your response in a clear, {self.tone} tone suitable for {self.name}."""
+
+@dataclass(frozen=True)
 class TaskContext:
     """Enhanced task context with tool-specific information"""
     task_type: str
@@ -44,21 +174,27 @@ class TaskContext:
     description: str
     tool: str
     stage: str
-    technical_requirements: List[str]
-    ui_requirements: List[str]
-    constraints: List[str]
+    technical_requirements: Tuple[str, ...]
+    ui_requirements: Tuple[str, ...]
+    constraints: Tuple[str, ...]
     page_type: Optional[str] = None
     component_type: Optional[str] = None
+    
+    def __post_init__(self):
+        _freeze_lists(self, 'technical_requirements', 'ui_requirements', 'constraints')
 
-@dataclass
+@dataclass(frozen=True)
 class ProjectInfo:
     """Project information structure"""
     name: str
     description: str
-    tech_stack: List[str]
+    tech_stack: Tuple[str, ...]
     target_audience: str
-    requirements: List[str]
+    requirements: Tuple[str, ...]
     tool: str
+    
+    def __post_init__(self):
+        _freeze_lists(self, 'tech_stack', 'requirements')
 
 class GeminiToolSpecificPromptGenerator:
     """Enhanced prompt generator with Google Gemini embeddings"""
@@ -66,18 +202,27 @@ class GeminiToolSpecificPromptGenerator:
     def __init__(self, 
                  chroma_path: str = "storage/chroma_gemini", 
                  embedding_provider: str = "google_gemini",
-                 embedding_model: Optional[str] = None):
+                 embedding_model: Optional[str] = None,
+                 search_ef: int = 48,
+                 vector_backend: str = "chroma"):
         """
         Initialize the generator with Gemini embeddings
         
         Args:
             chroma_path: Path to ChromaDB storage
-            embedding_provider: Provider for embeddings ("google_gemini" or "openai")  
+            embedding_provider: Provider for embeddings ("google_gemini" or "infinity").
+                Vectors are not interchangeable, so use a separate chroma_path per provider
             embedding_model: Specific model name (optional)
+            search_ef: HNSW candidate list size at query time. Lower values visit fewer
+                graph nodes (faster) at some cost in recall; must be at least k
+            vector_backend: "chroma" or "faiss". FAISS keeps one memory-mapped HNSW
+                index per tool under <chroma_path>/faiss, suited to build-once/query-many use
         """
         self.chroma_path = chroma_path
         self.embedding_provider = embedding_provider
         self.embedding_model = embedding_model
+        self.search_ef = search_ef
+        self.vector_backend = VectorStoreBackend(vector_backend)
         
         # Initialize embedding manager
         self.embedding_manager = create_embedding_manager(
@@ -85,12 +230,30 @@ class GeminiToolSpecificPromptGenerator:
             model_name=embedding_model
         )
         
-        self.vector_store = None
+        self.vector_stores: Dict[str, Any] = {}
+        self._chroma_client = None
+        self.text_splitter = SplitThenMergeSplitter()
+        self._store_lock = threading.Lock()
+        
+        # Per-instance memoization of query embeddings and retrieval results. Cached results are
+        # keyed on the store generation, which ingestion bumps after each committed batch, so a
+        # search that overlaps a write cannot leave a stale entry behind
+        self._embed_query = functools.lru_cache(maxsize=4096)(self._compute_query_embedding)
+        self._retrieve_cached = functools.lru_cache(maxsize=1024)(self._retrieve)
+        self._generate_prompt_cached = functools.lru_cache(maxsize=512)(self._generate_prompt)
+        self._cache_lock = threading.Lock()
+        self._generation = 0
+        
         self.tools_config = self._load_all_tools_config()
         self.available_tools = list(self.tools_config.keys())
         
         # Initialize vector store
         self._initialize_vector_store()
+        
+        # update_vector_store hands chunks to a worker thread, started on first use
+        self._ingest_q: Optional["queue.Queue[Document]"] = None
+        self._ingest_thread: Optional[threading.Thread] = None
+        self._ingest_finalizer: Optional[weakref.finalize] = None
     
     def _load_all_tools_config(self) -> Dict[str, ToolConfig]:
         """Load configuration for all available tools"""
@@ -102,12 +265,16 @@ class GeminiToolSpecificPromptGenerator:
             config_dir.mkdir(parents=True, exist_ok=True)
             self._create_default_tools_config(config_dir)
         
-        for config_file in config_dir.glob("*.yaml"):
-            tool_name = config_file.stem
+        # One directory scan; DirEntry caches its stat result
+        with os.scandir(config_dir) as it:
+            entries = sorted((e for e in it if e.name.endswith(".yaml") and e.is_file()), key=lambda e: e.name)
+        signature = tuple((e.path, e.stat().st_mtime_ns) for e in entries)
+        
+        # Deep copy so ToolConfig lists and dicts never alias the cached parse
+        raw_configs = copy.deepcopy(_load_tool_configs_cached(signature))
+        
+        for tool_name, config_data in raw_configs.items():
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f)
-                
                 tools_config[tool_name] = ToolConfig(
                     name=config_data.get('tool_name', tool_name),
                     format=config_data.get('format', 'structured'),
@@ -162,16 +329,22 @@ class GeminiToolSpecificPromptGenerator:
                 yaml.dump(config, f, default_flow_style=False)
     
     def _initialize_vector_store(self):
-        """Initialize or load the vector store with Gemini embeddings"""
+        """Initialize or load the per-tool vector stores with Gemini embeddings"""
         if os.path.exists(self.chroma_path):
-            # Load existing vector store
+            # Load existing vector stores
             try:
-                self.vector_store = Chroma(
-                    persist_directory=self.chroma_path,
-                    embedding_function=self.embedding_manager.get_embedding_model()
-                )
-                print(f"Loaded existing vector store from {self.chroma_path}")
-                print(f"Using {self.embedding_provider} embeddings with model: {self.embedding_manager.config.model_name}")
+                for tool in self._list_stored_tools():
+                    self.vector_stores[tool] = self._open_vector_store(tool)
+                
+                if not self.vector_stores:
+                    if self._migrate_legacy_collection():
+                        return
+                    print("No per-tool collections found. Creating new vector store...")
+                    self._create_vector_store()
+                    return
+                
+                print(f"Loaded {len(self.vector_stores)} tool collections from {self.chroma_path}")
+                print(f"Using {self.embedding_provider} embeddings with model: {self.embedding_manager.embedding_config.model_name}")
             except Exception as e:
                 print(f"Error loading vector store: {e}")
                 print("Creating new vector store...")
@@ -179,35 +352,291 @@ class GeminiToolSpecificPromptGenerator:
         else:
             self._create_vector_store()
     
+    def _migrate_legacy_collection(self) -> int:
+        """
+        Copy a single-collection store into per-tool collections, reusing its stored embeddings
+        
+        Stores written before the per-tool layout keep every chunk in LangChain's default
+        collection. The legacy collection is left in place so it can be checked and deleted.
+        
+        Returns:
+            Number of chunks migrated (0 if there was nothing to migrate)
+        """
+        if self.vector_backend is not VectorStoreBackend.CHROMA:
+            return 0
+        
+        try:
+            legacy = self._get_chroma_client().get_collection(LEGACY_COLLECTION_NAME)
+            total = legacy.count()
+        except Exception:
+            return 0
+        if not total:
+            return 0
+        
+        print(f"Migrating {total} chunks from the legacy '{LEGACY_COLLECTION_NAME}' collection to per-tool collections...")
+        for offset in range(0, total, ADD_BATCH_SIZE):
+            batch = legacy.get(
+                include=["embeddings", "documents", "metadatas"],
+                limit=ADD_BATCH_SIZE,
+                offset=offset
+            )
+            splits = [
+                Document(page_content=text, metadata=dict(metadata or {}))
+                for text, metadata in zip(batch["documents"], batch["metadatas"])
+            ]
+            self._write_splits(splits, batch["documents"], [list(embedding) for embedding in batch["embeddings"]])
+        
+        print(f"Migrated into {len(self.vector_stores)} tool collections; "
+              f"the '{LEGACY_COLLECTION_NAME}' collection can be deleted once verified")
+        return total
+    
+    def _list_stored_tools(self) -> List[str]:
+        """List the tools that already have a persisted collection or index"""
+        if self.vector_backend is VectorStoreBackend.FAISS:
+            # Indexes saved without a JSON docstore (older pickle docstores) are rebuilt
+            return sorted(path.stem for path in self._faiss_dir.glob("*.index") if FaissBackend.is_saved(path))
+        
+        tools = []
+        for collection in self._get_chroma_client().list_collections():
+            name = getattr(collection, "name", collection)
+            if name.startswith(TOOL_COLLECTION_PREFIX):
+                tools.append(name[len(TOOL_COLLECTION_PREFIX):])
+        return tools
+    
+    @property
+    def _faiss_dir(self) -> Path:
+        """Directory holding the per-tool FAISS indexes"""
+        return Path(self.chroma_path) / "faiss"
+    
+    def _get_chroma_client(self):
+        """Get the persistent ChromaDB client shared by all tool collections"""
+        if self._chroma_client is None:
+            self._chroma_client = chromadb.PersistentClient(path=self.chroma_path)
+        return self._chroma_client
+    
+    def _open_vector_store(self, tool: str):
+        """Open (or create) a tool's persistent collection or FAISS index with tuned HNSW parameters"""
+        if self.vector_backend is VectorStoreBackend.FAISS:
+            return FaissBackend(
+                str(self._faiss_dir / f"{tool}.index"),
+                hnsw_m=HNSW_METADATA["hnsw:M"],
+                ef_construction=HNSW_METADATA["hnsw:construction_ef"],
+                ef_search=self.search_ef
+            )
+        
+        store = Chroma(
+            client=self._get_chroma_client(),
+            collection_name=f"{TOOL_COLLECTION_PREFIX}{tool}",
+            embedding_function=self.embedding_manager.get_embedding_model(),
+            collection_metadata={**HNSW_METADATA, "hnsw:search_ef": self.search_ef}
+        )
+        
+        # Collections created earlier keep their original search_ef; update it in place
+        collection = self._get_chroma_client().get_collection(f"{TOOL_COLLECTION_PREFIX}{tool}")
+        metadata = dict(collection.metadata or {})
+        if metadata.get("hnsw:search_ef") != self.search_ef:
+            # The distance function cannot be passed to modify()
+            metadata.pop("hnsw:space", None)
+            metadata["hnsw:search_ef"] = self.search_ef
+            try:
+                collection.modify(metadata=metadata)
+            except Exception as e:
+                print(f"Warning: Could not set search_ef for {collection.name}: {e}")
+        
+        return store
+    
     def _create_vector_store(self):
-        """Create new vector store from documentation"""
+        """Create new vector stores from documentation"""
         documents = self._load_documents()
         
         if not documents:
-            print("No documents found. Creating empty vector store.")
-            self.vector_store = Chroma(
-                persist_directory=self.chroma_path,
-                embedding_function=self.embedding_manager.get_embedding_model()
-            )
+            print("No documents found. Vector store will be empty.")
             return
         
         # Split documents
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200
-        )
-        splits = text_splitter.split_documents(documents)
+        splits = self.text_splitter.split_documents(documents)
         
-        # Create vector store
-        self.vector_store = Chroma.from_documents(
-            documents=splits,
-            embedding=self.embedding_manager.get_embedding_model(),
-            persist_directory=self.chroma_path
-        )
+        # Fill the per-tool collections with concurrently embedded chunks
+        self._add_splits(splits)
         
-        print(f"Created vector store with {len(splits)} document chunks")
+        print(f"Created {len(self.vector_stores)} tool collections with {len(splits)} document chunks")
         print(f"Using {self.embedding_provider} embeddings")
     
+    async def _embed_batches(self, texts: List[str], batch_size: Optional[int] = None, 
+                             concurrency: int = 8) -> List[List[float]]:
+        """
+        Embed texts in batches with up to `concurrency` Gemini requests in flight
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Texts per request (uses the embedding config default if None)
+            concurrency: Maximum number of concurrent requests
+            
+        Returns:
+            Embeddings in the same order as texts
+        """
+        if batch_size is None:
+            batch_size = self.embedding_manager.embedding_config.batch_size
+        
+        embed_model = self.embedding_manager.get_embedding_model()
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def embed(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await embed_model.aembed_documents(batch)
+        
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(embed(batch) for batch in batches))
+        return [embedding for batch_embeddings in results for embedding in batch_embeddings]
+    
+    def _embed_batches_sync(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts batch by batch on the calling thread"""
+        batch_size = self.embedding_manager.embedding_config.batch_size
+        embed_model = self.embedding_manager.get_embedding_model()
+        return [
+            embedding
+            for i in range(0, len(texts), batch_size)
+            for embedding in embed_model.embed_documents(texts[i:i + batch_size])
+        ]
+    
+    def _add_splits(self, splits: List[Document]):
+        """Embed document chunks up front and add them to their tool's collection"""
+        if not splits:
+            return
+        
+        texts = [doc.page_content for doc in splits]
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            embeddings = asyncio.run(self._embed_batches(texts))
+        else:
+            # asyncio.run cannot start inside a running event loop (a notebook or an
+            # async server calling us), so embed the batches one after another instead
+            embeddings = self._embed_batches_sync(texts)
+        self._write_splits(splits, texts, embeddings)
+    
+    def _write_splits(self, splits: List[Document], texts: List[str], embeddings: List[List[float]]):
+        """Add embedded chunks to their tool's collection"""
+        # Group chunk indices by tool so each search only covers that tool's docs
+        by_tool: Dict[str, List[int]] = {}
+        for i, doc in enumerate(splits):
+            by_tool.setdefault(doc.metadata.get('tool') or DEFAULT_TOOL_KEY, []).append(i)
+        
+        for tool, indices in by_tool.items():
+            with self._store_lock:
+                if tool not in self.vector_stores:
+                    self.vector_stores[tool] = self._open_vector_store(tool)
+            
+            store = self.vector_stores[tool]
+            if isinstance(store, FaissBackend):
+                store.add(
+                    embeddings=[embeddings[i] for i in indices],
+                    documents=[texts[i] for i in indices],
+                    metadatas=[splits[i].metadata for i in indices]
+                )
+                store.save()
+                continue
+            
+            # Bypass LangChain's add_documents, which would embed the chunks serially again
+            collection = self._get_chroma_client().get_collection(f"{TOOL_COLLECTION_PREFIX}{tool}")
+            for start in range(0, len(indices), ADD_BATCH_SIZE):
+                batch = indices[start:start + ADD_BATCH_SIZE]
+                collection.add(
+                    ids=[str(uuid.uuid4()) for _ in batch],
+                    embeddings=[embeddings[i] for i in batch],
+                    metadatas=[splits[i].metadata for i in batch],
+                    documents=[texts[i] for i in batch]
+                )
+        
+        # The batch is committed: cached search results (and prompts built from them) may no
+        # longer be the best matches
+        self._invalidate_caches()
+    
+    def _invalidate_caches(self):
+        """Retire every cached retrieval result and prompt after the stores change"""
+        with self._cache_lock:
+            self._generation += 1
+            self._retrieve_cached.cache_clear()
+            self._generate_prompt_cached.cache_clear()
+    
+    def _start_ingest_worker(self) -> "queue.Queue[Document]":
+        """Start the background ingest worker if it is not running yet and return its queue"""
+        with self._store_lock:
+            if self._ingest_q is None:
+                self._ingest_q = queue.Queue(maxsize=10000)
+                self._ingest_thread = threading.Thread(
+                    target=self._ingest_worker, args=(self._ingest_q,), name="chroma-ingest", daemon=True
+                )
+                self._ingest_thread.start()
+                # Runs on close() or at interpreter exit; holds only the queue, never the generator
+                self._ingest_finalizer = weakref.finalize(self, _stop_ingest_worker, self._ingest_q, INGEST_CLOSE_TIMEOUT)
+            return self._ingest_q
+    
+    def _ingest_worker(self, ingest_q: "queue.Queue[Document]"):
+        """Drain the ingest queue, embedding and adding chunks in batches until a None sentinel"""
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + INGEST_BATCH_TIMEOUT
+            item = ingest_q.get()
+            while True:
+                if item is None:
+                    ingest_q.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= INGEST_BATCH_SIZE or remaining <= 0:
+                    break
+                try:
+                    item = ingest_q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            
+            if not batch:
+                continue
+            try:
+                texts = [doc.page_content for doc in batch]
+                embeddings = self.embedding_manager.get_embedding_model().embed_documents(texts)
+                self._write_splits(batch, texts, embeddings)
+            except Exception as e:
+                print(f"Error ingesting {len(batch)} document chunks: {e}")
+            finally:
+                for _ in batch:
+                    ingest_q.task_done()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued document chunk has been added to the vector store
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            
+        Returns:
+            True if the queue was fully drained
+        """
+        ingest_q = self._ingest_q
+        if ingest_q is None:
+            return True
+        if timeout is None:
+            ingest_q.join()
+            return True
+        return _drain_ingest_queue(ingest_q, timeout)
+    
+    def close(self):
+        """Flush queued writes (for at most INGEST_CLOSE_TIMEOUT seconds) and stop the ingest worker
+        
+        The worker thread references the generator, so call this when done ingesting to let the
+        generator and its clients be garbage collected. update_vector_store starts a new worker.
+        """
+        with self._store_lock:
+            finalizer, thread = self._ingest_finalizer, self._ingest_thread
+            self._ingest_q = self._ingest_thread = self._ingest_finalizer = None
+        
+        if finalizer is not None:
+            finalizer()
+            thread.join(INGEST_CLOSE_TIMEOUT)
+    
     def _load_documents(self) -> List[Document]:
         """Load documents from various sources"""
         documents = []
@@ -215,76 +644,104 @@ class GeminiToolSpecificPromptGenerator:
         # Load from data directory if it exists
         data_dir = Path("data")
         if data_dir.exists():
-            for doc_folder in data_dir.iterdir():
-                if doc_folder.is_dir() and doc_folder.name.endswith('_docs'):
-                    try:
-                        loader = DirectoryLoader(
-                            str(doc_folder),
-                            glob="**/*.{txt,md,json}",
-                            loader_cls=TextLoader,
-                            loader_kwargs={'encoding': 'utf-8'}
-                        )
-                        folder_docs = loader.load()
-                        
-                        # Add metadata
-                        tool_name = doc_folder.name.replace('_docs', '')
-                        for doc in folder_docs:
-                            doc.metadata.update({
-                                'tool': tool_name,
-                                'source_type': 'documentation'
-                            })
-                        
+            folders = [
+                folder for folder in data_dir.iterdir()
+                if folder.is_dir() and folder.name.endswith('_docs')
+            ]
+            
+            # Folder loads are I/O-bound, so overlap them on a thread pool
+            if folders:
+                with ThreadPoolExecutor(max_workers=min(32, len(folders))) as executor:
+                    for folder_docs in executor.map(self._load_folder, folders):
                         documents.extend(folder_docs)
-                        print(f"Loaded {len(folder_docs)} documents from {doc_folder}")
-                        
-                    except Exception as e:
-                        print(f"Error loading documents from {doc_folder}: {e}")
         
         return documents
     
-    def get_relevant_context(self, query: str, tool: str, k: int = 5) -> List[str]:
-        """Get relevant documentation context for a query"""
-        if not self.vector_store:
-            return []
-        
+    def _load_folder(self, doc_folder: Path) -> List[Document]:
+        """Load and tag all documents in a single <tool>_docs folder"""
         try:
-            # Enhanced query with tool context
-            enhanced_query = f"{tool} {query}"
-            
-            # Search for relevant documents
-            docs = self.vector_store.similarity_search(
-                enhanced_query,
-                k=k,
-                filter={"tool": tool} if tool in self.available_tools else None
+            loader = DirectoryLoader(
+                str(doc_folder),
+                glob="**/*.{txt,md,json}",
+                loader_cls=TextLoader,
+                loader_kwargs={'encoding': 'utf-8'}
             )
+            folder_docs = loader.load()
             
-            # Extract context
-            context = []
-            for doc in docs:
-                context.append(doc.page_content)
+            # Add metadata
+            tool_name = doc_folder.name.replace('_docs', '')
+            for doc in folder_docs:
+                doc.metadata.update({
+                    'tool': tool_name,
+                    'source_type': 'documentation'
+                })
             
-            return context
+            print(f"Loaded {len(folder_docs)} documents from {doc_folder}")
+            return folder_docs
             
+        except Exception as e:
+            print(f"Error loading documents from {doc_folder}: {e}")
+            return []
+    
+    def get_relevant_context(self, query: str, tool: str, k: int = 5) -> List[str]:
+        """Get relevant documentation context for a query"""
+        try:
+            return self._fetch_context(query, tool, k)
         except Exception as e:
             print(f"Error retrieving context: {e}")
             return []
     
+    def _fetch_context(self, query: str, tool: str, k: int) -> List[str]:
+        """Retrieve documentation context, letting embedding and vector store errors propagate"""
+        if not self.vector_stores:
+            return []
+        
+        # Enhanced query with tool context
+        enhanced_query = f"{tool} {query}"
+        
+        return list(self._retrieve_cached(enhanced_query, k, tool, self._generation))
+    
+    def _compute_query_embedding(self, text: str) -> Tuple[float, ...]:
+        """Embed a query (memoized via _embed_query)"""
+        return tuple(self.embedding_manager.get_embedding_model().embed_query(text))
+    
+    def _retrieve(self, enhanced_query: str, k: int, tool: str, generation: int) -> Tuple[str, ...]:
+        """Search the tool's own collection (memoized via _retrieve_cached; generation only keys the cache)"""
+        # Tools without documentation get no context rather than other tools' chunks
+        store = self.vector_stores.get(tool)
+        if store is None:
+            return ()
+        
+        # Embed once and search by vector, skipping LangChain's per-query text path
+        query_embedding = list(self._embed_query(enhanced_query))
+        docs = store.similarity_search_by_vector(query_embedding, k=k)
+        return tuple(doc.page_content for doc in docs)
+    
     def generate_prompt(self, project_info: ProjectInfo, task_context: TaskContext) -> str:
         """Generate enhanced prompt using RAG and tool-specific configuration"""
+        try:
+            return self._generate_prompt_cached(project_info, task_context, self._generation)
+        except Exception as e:
+            # Retrieval failed, so nothing was memoized; this prompt goes without documentation
+            # and the next identical request retries the search
+            print(f"Error retrieving context: {e}")
+            return self._build_prompt(project_info, task_context, [])
+    
+    def _generate_prompt(self, project_info: ProjectInfo, task_context: TaskContext, generation: int) -> str:
+        """Retrieve context and build the prompt (memoized via _generate_prompt_cached; generation only keys the cache)"""
+        # Get relevant context from vector store; errors propagate so a degraded prompt is never cached
+        context_query = f"{task_context.description} {task_context.task_type}"
+        relevant_context = self._fetch_context(context_query, task_context.tool, k=3)
         
+        return self._build_prompt(project_info, task_context, relevant_context)
+    
+    def _build_prompt(self, project_info: ProjectInfo, task_context: TaskContext, relevant_context: List[str]) -> str:
+        """Assemble the prompt sections around the retrieved documentation context"""
         # Get tool configuration
         tool_config = self.tools_config.get(task_context.tool)
         if not tool_config:
             tool_config = self._get_default_tool_config(task_context.tool)
         
-        # Get relevant context from vector store
-        context_query = f"{task_context.description} {task_context.task_type}"
-        relevant_context = self.get_relevant_context(
-            context_query, 
-            task_context.tool, 
-            k=3
-        )
-        
         # Build prompt sections
         prompt_sections = []
         
@@ -336,7 +793,7 @@ class GeminiToolSpecificPromptGenerator:
     def _build_project_context(self, project_info: ProjectInfo) -> str:
         """Build project context section"""
         tech_stack = ", ".join(project_info.tech_stack) if project_info.tech_stack else "Not specified"
-        requirements = "\n".join([f"- {req}" for req in project_info.requirements])
+        requirements = "\n".join(map(_REQ_FMT, project_info.requirements))
         
         return f"""## Project Information
 
@@ -350,9 +807,9 @@ class GeminiToolSpecificPromptGenerator:
     
     def _build_task_context(self, task_context: TaskContext) -> str:
         """Build task context section"""
-        tech_reqs = "\n".join([f"- {req}" for req in task_context.technical_requirements])
-        ui_reqs = "\n".join([f"- {req}" for req in task_context.ui_requirements])
-        constraints = "\n".join([f"- {constraint}" for constraint in task_context.constraints])
+        tech_reqs = "\n".join(map(_REQ_FMT, task_context.technical_requirements))
+        ui_reqs = "\n".join(map(_REQ_FMT, task_context.ui_requirements))
+        constraints = "\n".join(map(_REQ_FMT, task_context.constraints))
         
         return f"""## Task Context
 
@@ -369,7 +826,7 @@ class GeminiToolSpecificPromptGenerator:
     
     def _build_documentation_context(self, context: List[str]) -> str:
         """Build documentation context section"""
-        context_text = "\n\n".join([f"### Context {i+1}\n{ctx}" for i, ctx in enumerate(context)])
+        context_text = "\n\n".join(f"### Context {i}\n{ctx}" for i, ctx in enumerate(context, 1))
         
         return f"""## Relevant Documentation
 
@@ -377,62 +834,28 @@ class GeminiToolSpecificPromptGenerator:
     
     def _build_strategy_section(self, tool_config: ToolConfig, task_context: TaskContext) -> str:
         """Build tool-specific strategy section"""
-        strategies = []
-        
-        if tool_config.strategies.get("step_by_step"):
-            strategies.append("- Break down the task into clear, actionable steps")
-        
-        if tool_config.strategies.get("context_first"):
-            strategies.append("- Provide full context before implementation details")
-        
-        if tool_config.strategies.get("examples"):
-            strategies.append("- Include relevant examples and code snippets")
-        
-        if tool_config.strategies.get("incremental"):
-            strategies.append("- Focus on incremental improvements and iterations")
-        
-        strategy_text = "\n".join(strategies) if strategies else "- Follow standard development practices"
-        
-        return f"""## Implementation Strategy
-
-{strategy_text}
-
-**Tone**: {tool_config.tone}
-**Supported Components**: {", ".join(tool_config.components)}"""
+        return tool_config._strategy_section
     
     def _build_output_format(self, tool_config: ToolConfig) -> str:
         """Build output format section"""
-        return f"""## Expected Output
-
-Please provide a {tool_config.format} response that includes:
-
-1. **Implementation Plan**: Step-by-step approach
-2. **Code Structure**: File organization and architecture
-3. **Key Components**: Main features and functionality
-4. **Integration Points**: How components work together
-5. **Testing Strategy**: Validation and quality assurance
-6. **Next Steps**: Immediate actions to take
-
-Format your response in a clear, {tool_config.tone} tone suitable for {tool_config.name}."""
+        return tool_config._output_format
     
     def update_vector_store(self, new_documents: List[Document]):
-        """Update vector store with new documents"""
-        if not self.vector_store:
+        """Queue new documents for background ingestion (call flush() to wait)"""
+        if not self.vector_stores:
             self._create_vector_store()
             return
         
         try:
             # Split new documents
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200
-            )
-            splits = text_splitter.split_documents(new_documents)
+            splits = self.text_splitter.split_documents(new_documents)
             
-            # Add to vector store
-            self.vector_store.add_documents(splits)
+            # Hand off to the ingest worker
+            ingest_q = self._start_ingest_worker()
+            for split in splits:
+                ingest_q.put(split)
             
-            print(f"Added {len(splits)} new document chunks to vector store")
+            print(f"Queued {len(splits)} new document chunks for the vector store")
             
         except Exception as e:
             print(f"Error updating vector store: {e}")
@@ -2,6 +2,7 @@
 """
 CLI for Lovable.dev Prompt Generator
 Usage: python generate_prompt.py --tool lovable --task "build login page" --project "Task Manager App"
+       python generate_prompt.py --batch prompts.jsonl --output prompts_out.jsonl
 """
 
 import argparse
@@ -26,6 +27,11 @@ Examples:
   python generate_prompt.py --tool lovable --task "build login page" --project "Task Manager App"
   python generate_prompt.py --tool lovable --task "responsive dashboard" --project "Analytics Platform" --tech "React,Next.js,Tailwind"
   python generate_prompt.py --interactive
+  python generate_prompt.py --batch prompts.jsonl --output prompts_out.jsonl
+
+Batch files hold one JSON record per line:
+  {"project": {"name": "...", "description": "...", "tech_stack": [...]},
+   "task": {"task_type": "...", "description": "...", "technical_requirements": [...]}}
         """
     )
     
@@ -76,6 +82,11 @@ Examples:
         help='Run in interactive mode'
     )
     
+    parser.add_argument(
+        '--batch',
+        help='JSONL file of {"project": ..., "task": ...} records; writes one JSON result per line'
+    )
+    
     parser.add_argument(
         '--output',
         help='Output file path (default: stdout)'
@@ -138,6 +149,78 @@ def interactive_mode():
         'constraints': constraints
     }
 
+def build_contexts(data):
+    """Create the task and project context objects from an input data dict"""
+    task_context = TaskContext(
+        task_type=data['task_type'],
+        project_name=data['project_name'],
+        description=data['task_description'],
+        technical_requirements=data['tech_requirements'],
+        ui_requirements=data['ui_requirements'],
+        constraints=data['constraints']
+    )
+    
+    project_info = ProjectInfo(
+        name=data['project_name'],
+        description=data['project_description'],
+        tech_stack=data['tech_stack'],
+        target_audience=data['target_audience'],
+        requirements=data.get('project_requirements', [])
+    )
+    
+    return task_context, project_info
+
+def read_batch(path):
+    """Yield (line number, line) for each non-empty line of a JSONL batch file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                yield line_number, line
+
+def record_to_data(record):
+    """Map one batch record ({"project": ..., "task": ...}) to an input data dict"""
+    project = record.get('project', {})
+    task = record.get('task', {})
+    project_name = project.get('name') or task.get('project_name', 'Untitled Project')
+    task_type = task.get('task_type', '')
+    
+    return {
+        'project_name': project_name,
+        'project_description': project.get('description') or f"A modern web application: {project_name}",
+        'tech_stack': project.get('tech_stack') or ['React', 'Next.js', 'Tailwind CSS'],
+        'target_audience': project.get('target_audience', 'General users'),
+        'project_requirements': project.get('requirements', []),
+        'task_type': task_type,
+        'task_description': task.get('description') or task_type,
+        'tech_requirements': task.get('technical_requirements', []),
+        'ui_requirements': task.get('ui_requirements', []),
+        'constraints': task.get('constraints', [])
+    }
+
+def generate_batch(generator, path, validate=False):
+    """
+    Generate prompts for every record in a batch file with one generator instance
+    
+    A record that cannot be parsed or generated is reported on stderr and
+    yields None, so the rest of the batch still runs.
+    """
+    for line_number, line in read_batch(path):
+        try:
+            data = record_to_data(json.loads(line))
+            task_context, project_info = build_contexts(data)
+            result = {
+                'project': data['project_name'],
+                'task': data['task_type'],
+                'prompt': generator.generate_prompt(task_context, project_info)
+            }
+            if validate:
+                result['validation'] = generator.validate_prompt(result['prompt'])
+        except Exception as e:
+            print(f"❌ Record on line {line_number} failed: {e}", file=sys.stderr)
+            yield None
+            continue
+        yield result
+
 def get_task_suggestions(generator, project_type):
     """Get and display task suggestions"""
     suggestions = generator.get_task_suggestions(project_type)
@@ -153,12 +236,15 @@ def main():
     """Main CLI function"""
     args = parse_arguments()
     
+    # Banners and status lines stay off stdout when it carries batch records or is piped
+    log = sys.stderr if args.batch or not sys.stdout.isatty() else sys.stdout
+    
     # Initialize generator
     try:
         generator = LovablePromptGenerator()
-        print("✅ Prompt generator initialized successfully")
+        print("✅ Prompt generator initialized successfully", file=log)
     except Exception as e:
-        print(f"❌ Failed to initialize generator: {e}")
+        print(f"❌ Failed to initialize generator: {e}", file=sys.stderr)
         sys.exit(1)
     
     # Handle suggestions mode
@@ -167,12 +253,39 @@ def main():
         get_task_suggestions(generator, project_type)
         return
     
+    # Handle batch mode: the generator and its vector store are set up once for all records
+    if args.batch:
+        count = 0
+        failed = 0
+        try:
+            out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+            try:
+                for result in generate_batch(generator, args.batch, validate=args.validate):
+                    if result is None:
+                        failed += 1
+                        continue
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    count += 1
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+        except Exception as e:
+            print(f"❌ Batch generation failed after {count} prompts: {e}", file=sys.stderr)
+            sys.exit(1)
+        
+        if args.output:
+            print(f"✅ {count} prompts saved to {args.output}", file=log)
+        if failed:
+            print(f"❌ {failed} record(s) could not be processed", file=sys.stderr)
+            sys.exit(1)
+        return
+    
     # Get input data
     if args.interactive:
         data = interactive_mode()
     else:
         if not args.task or not args.project:
-            print("❌ Error: --task and --project are required (or use --interactive)")
+            print("❌ Error: --task and --project are required (or use --interactive)", file=sys.stderr)
             sys.exit(1)
         
         data = {
@@ -188,52 +301,40 @@ def main():
         }
     
     # Create context objects
-    task_context = TaskContext(
-        task_type=data['task_type'],
-        project_name=data['project_name'],
-        description=data['task_description'],
-        technical_requirements=data['tech_requirements'],
-        ui_requirements=data['ui_requirements'],
-        constraints=data['constraints']
-    )
-    
-    project_info = ProjectInfo(
-        name=data['project_name'],
-        description=data['project_description'],
-        tech_stack=data['tech_stack'],
-        target_audience=data['target_audience'],
-        requirements=[]
-    )
+    task_context, project_info = build_contexts(data)
     
     # Generate prompt
-    print("\n⚡ Generating prompt...")
+    print("\n⚡ Generating prompt...", file=log)
     try:
         prompt = generator.generate_prompt(task_context, project_info)
         
         # Validate if requested
         if args.validate:
-            print("\n🔍 Validating prompt...")
+            print("\n🔍 Validating prompt...", file=log)
             validation = generator.validate_prompt(prompt)
             
-            print(f"Validation Score: {validation['score']}/100")
-            print(f"Valid: {'✅' if validation['is_valid'] else '❌'}")
+            print(f"Validation Score: {validation['score']}/100", file=log)
+            print(f"Valid: {'✅' if validation['is_valid'] else '❌'}", file=log)
             
             if validation['issues']:
-                print("Issues found:")
+                print("Issues found:", file=log)
                 for issue in validation['issues']:
-                    print(f"  - {issue}")
+                    print(f"  - {issue}", file=log)
             
             if validation['suggestions']:
-                print("Suggestions:")
+                print("Suggestions:", file=log)
                 for suggestion in validation['suggestions']:
-                    print(f"  - {suggestion}")
-            print()
+                    print(f"  - {suggestion}", file=log)
+            print(file=log)
         
         # Output prompt
         if args.output:
             with open(args.output, 'w', encoding='utf-8') as f:
                 f.write(prompt)
-            print(f"✅ Prompt saved to {args.output}")
+            print(f"✅ Prompt saved to {args.output}", file=log)
+        elif log is sys.stderr:
+            # Piped: the prompt alone
+            print(prompt)
         else:
             print("\n" + "=" * 80)
             print("GENERATED LOVABLE.DEV PROMPT")
@@ -242,7 +343,7 @@ def main():
             print("=" * 80)
             
     except Exception as e:
-        print(f"❌ Failed to generate prompt: {e}")
+        print(f"❌ Failed to generate prompt: {e}", file=sys.stderr)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -7,66 +7,170 @@ import argparse
 import sys
 import os
 import json
+import functools
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # Add the project root to the Python path
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
 from src.core.types import TaskContext, ProjectInfo, PromptStage, SupportedTool, AppStructure, PageSpec, FlowConnection
-from typing import List, Dict, Any, Literal
+from src.core.shared_types import _bullets
+from typing import List, Dict, Any, Iterator, Literal, Optional, TextIO, Tuple
+
+# Task guidelines keyed by a substring of the task type, checked in order
+_GUIDELINES_MAP = MappingProxyType({
+    "authentication": (
+        "Use NextAuth.js for secure authentication",
+        "Implement proper session management",
+        "Add password strength validation",
+        "Include social login options",
+        "Ensure secure token handling"
+    ),
+    "dashboard": (
+        "Use responsive grid layout",
+        "Implement real-time data updates",
+        "Add interactive charts and graphs",
+        "Include filtering and search capabilities",
+        "Optimize for mobile viewing"
+    ),
+    "ecommerce": (
+        "Implement product catalog with search",
+        "Add shopping cart functionality",
+        "Include secure payment processing",
+        "Optimize for conversion rates",
+        "Mobile-first responsive design"
+    ),
+    "payment": (
+        "Use Stripe or similar secure payment processor",
+        "Implement proper error handling for failed payments",
+        "Add receipt generation and email confirmation",
+        "Ensure PCI compliance",
+        "Include subscription and recurring payment support"
+    )
+})
+_GUIDELINE_KEYS = tuple(_GUIDELINES_MAP.items())
+
+_DEFAULT_GUIDELINES = (
+    "Follow modern web development best practices",
+    "Ensure responsive design for all devices",
+    "Implement proper error handling",
+    "Use TypeScript for type safety",
+    "Optimize for performance and accessibility"
+)
+
+# Display names for every tool and stage, computed once
+_TOOL_DISPLAY = MappingProxyType({tool: tool.value.title() for tool in SupportedTool})
+_STAGE_DISPLAY = MappingProxyType({stage: stage.value.replace('_', ' ').title() for stage in PromptStage})
+
+# Numbered interactive menus; the first entry is the default for invalid choices
+_TOOLS = (
+    SupportedTool.LOVABLE,
+    SupportedTool.UIZARD,
+    SupportedTool.ADALO,
+    SupportedTool.FLUTTERFLOW,
+    SupportedTool.FRAMER,
+    SupportedTool.BUBBLE
+)
+_STAGES = (
+    PromptStage.APP_SKELETON,
+    PromptStage.PAGE_UI,
+    PromptStage.FLOW_CONNECTIONS,
+    PromptStage.FEATURE_SPECIFIC,
+    PromptStage.DEBUGGING,
+    PromptStage.OPTIMIZATION
+)
+_TASK_TYPES = (
+    "build complete application",
+    "create responsive dashboard",
+    "implement authentication",
+    "add payment integration",
+    "optimize performance",
+    "enhance accessibility",
+    "debug and refactor"
+)
+
+_TOOL_MENU = "\n🛠️ AI Development Tool Selection\nAvailable tools:\n" + "".join(
+    f"{i}. {_TOOL_DISPLAY[tool]}\n" for i, tool in enumerate(_TOOLS, 1)
+)
+_STAGE_MENU = "\n📋 Development Stage\nAvailable stages:\n" + "".join(
+    f"{i}. {_STAGE_DISPLAY[stage]}\n" for i, stage in enumerate(_STAGES, 1)
+)
+_TASK_MENU = "\n🎯 Task Configuration\nAvailable task types:\n" + "".join(
+    f"{i}. {task_type}\n" for i, task_type in enumerate(_TASK_TYPES, 1)
+) + f"{len(_TASK_TYPES) + 1}. custom\n"
+
+def _menu_index(choice: str, options: tuple) -> int:
+    """Map a 1-based menu choice to an index, falling back to the first option"""
+    if choice.isdigit() and 1 <= int(choice) <= len(options):
+        return int(choice) - 1
+    return 0
+
+def _ask(prompt: str, default: str = "", stream: Optional[TextIO] = None) -> str:
+    """Prompt on the UI stream (stdout by default) and read one stripped line from stdin, or the default"""
+    stream = stream or sys.stdout
+    stream.write(prompt)
+    stream.flush()
+    return sys.stdin.readline().strip() or default
+
+def _collect_lines(title: str, stream: Optional[TextIO] = None) -> List[str]:
+    """Read a pasted block of lines up to a blank line; a leading '- ' bullet is optional"""
+    stream = stream or sys.stdout
+    stream.write(title + " (blank line to end):\n")
+    stream.flush()
+    lines = []
+    read = sys.stdin.readline
+    while True:
+        line = read()
+        if line.strip() == '':
+            return lines
+        line = line.strip()
+        if line.startswith('- '):
+            line = line[2:].lstrip()
+        if line:
+            lines.append(line)
 
 def interactive_mode():
-    """Interactive prompt generation mode"""
-    print("🚀 Multi-Tool Prompt Generator - Interactive Mode")
-    print("=" * 60)
+    """
+    Interactive prompt generation mode
     
-    # Tool Selection
-    print("\n🛠️ AI Development Tool Selection")
-    print("Available tools:")
-    tools = {
-        "1": SupportedTool.LOVABLE,
-        "2": SupportedTool.UIZARD,
-        "3": SupportedTool.ADALO,
-        "4": SupportedTool.FLUTTERFLOW,
-        "5": SupportedTool.FRAMER,
-        "6": SupportedTool.BUBBLE
-    }
+    Menus and questions go to stdout on a terminal and to stderr when stdout
+    is redirected, so only the prompt itself lands in the redirect.
+    """
+    ui = sys.stdout if sys.stdout.isatty() else sys.stderr
+    ask = functools.partial(_ask, stream=ui)
     
-    for key, tool in tools.items():
-        print(f"{key}. {tool.value.title()}")
+    ui.write("🚀 Multi-Tool Prompt Generator - Interactive Mode\n" + "=" * 60 + "\n")
     
-    tool_choice = input("Select development tool (1-6): ").strip()
-    target_tool = tools.get(tool_choice, SupportedTool.LOVABLE)
-    print(f"Selected: {target_tool.value.title()}")
+    # Tool Selection
+    ui.write(_TOOL_MENU)
+    target_tool = _TOOLS[_menu_index(ask("Select development tool (1-6): "), _TOOLS)]
     
     # Stage Selection
-    print("\n📋 Development Stage")
-    print("Available stages:")
-    stages = {
-        "1": PromptStage.APP_SKELETON,
-        "2": PromptStage.PAGE_UI,
-        "3": PromptStage.FLOW_CONNECTIONS,
-        "4": PromptStage.FEATURE_SPECIFIC,
-        "5": PromptStage.DEBUGGING,
-        "6": PromptStage.OPTIMIZATION
-    }
-    
-    for key, stage in stages.items():
-        stage_name = stage.value.replace('_', ' ').title()
-        print(f"{key}. {stage_name}")
-    
-    stage_choice = input("Select development stage (1-6): ").strip()
-    target_stage = stages.get(stage_choice, PromptStage.APP_SKELETON)
-    print(f"Selected: {target_stage.value.replace('_', ' ').title()}")
+    ui.write(f"Selected: {_TOOL_DISPLAY[target_tool]}\n" + _STAGE_MENU)
+    target_stage = _STAGES[_menu_index(ask("Select development stage (1-6): "), _STAGES)]
+    ui.write(
+        f"Selected: {_STAGE_DISPLAY[target_stage]}\n"
+        "\n📋 Project Information\n"
+    )
     
     # Project Information
-    print("\n📋 Project Information")
-    project_name = input("Project Name: ").strip() or "MyApp"
-    project_description = input("Project Description: ").strip() or "A modern web application"
-    target_audience = input("Target Audience: ").strip() or "General users"
-    industry = input("Industry (optional): ").strip() or None
+    project_name = ask("Project Name: ", "MyApp")
+    project_description = ask("Project Description: ", "A modern web application")
+    target_audience = ask("Target Audience: ", "General users")
+    industry = ask("Industry (optional): ") or None
     
-    complexity_input = input("Complexity Level (simple/medium/complex): ").strip().lower()
+    complexity_input = ask("Complexity Level (simple/medium/complex): ").lower()
     complexity_level: Literal["simple", "medium", "complex"]
     if complexity_input in ["simple", "medium", "complex"]:
         complexity_level = complexity_input  # type: ignore
@@ -74,69 +178,29 @@ def interactive_mode():
         complexity_level = "medium"
     
     # Technology Stack
-    print("\nTechnology Stack (comma-separated):")
-    print("Examples: Next.js, React, TypeScript, Tailwind CSS")
-    tech_input = input("Tech Stack: ").strip()
+    ui.write(
+        "\nTechnology Stack (comma-separated):\n"
+        "Examples: Next.js, React, TypeScript, Tailwind CSS\n"
+    )
+    tech_input = ask("Tech Stack: ")
     tech_stack = [tech.strip() for tech in tech_input.split(',') if tech.strip()] or ["Next.js", "React"]
     
     # Task Configuration
-    print("\n🎯 Task Configuration")
-    print("Available task types:")
-    print("1. build complete application")
-    print("2. create responsive dashboard")
-    print("3. implement authentication")
-    print("4. add payment integration")
-    print("5. optimize performance")
-    print("6. enhance accessibility")
-    print("7. debug and refactor")
-    print("8. custom")
-    
-    task_choice = input("Select task type (1-8): ").strip()
-    task_types = {
-        "1": "build complete application",
-        "2": "create responsive dashboard", 
-        "3": "implement authentication",
-        "4": "add payment integration",
-        "5": "optimize performance",
-        "6": "enhance accessibility",
-        "7": "debug and refactor"
-    }
+    ui.write(_TASK_MENU)
+    task_choice = ask("Select task type (1-8): ")
     
-    if task_choice in task_types:
-        task_type = task_types[task_choice]
-    elif task_choice == "8":
-        task_type = input("Enter custom task type: ").strip()
+    if task_choice == str(len(_TASK_TYPES) + 1):
+        task_type = ask("Enter custom task type: ")
     else:
-        task_type = "build complete application"
+        task_type = _TASK_TYPES[_menu_index(task_choice, _TASK_TYPES)]
     
-    task_description = input("Task Description: ").strip() or f"Create a modern {task_type}"
+    task_description = ask("Task Description: ", f"Create a modern {task_type}")
     
     # Requirements
-    print("\n📝 Requirements (press Enter twice to finish each section)")
-    
-    print("Technical Requirements:")
-    tech_requirements = []
-    while True:
-        req = input("- ").strip()
-        if not req:
-            break
-        tech_requirements.append(req)
-    
-    print("UI/UX Requirements:")
-    ui_requirements = []
-    while True:
-        req = input("- ").strip()
-        if not req:
-            break
-        ui_requirements.append(req)
-    
-    print("Constraints:")
-    constraints = []
-    while True:
-        constraint = input("- ").strip()
-        if not constraint:
-            break
-        constraints.append(constraint)
+    ui.write("\n📝 Requirements\n")
+    tech_requirements = _collect_lines("Technical Requirements", ui)
+    ui_requirements = _collect_lines("UI/UX Requirements", ui)
+    constraints = _collect_lines("Constraints", ui)
     
     # Stage-specific data collection
     app_structure = None
@@ -144,11 +208,11 @@ def interactive_mode():
     flow_connections = None
     
     if target_stage == PromptStage.APP_SKELETON:
-        print("\n🏗️ App Structure (optional)")
-        pages_input = input("Main pages (comma-separated): ").strip()
+        ui.write("\n🏗️ App Structure (optional)\n")
+        pages_input = ask("Main pages (comma-separated): ")
         if pages_input:
             pages = [page.strip() for page in pages_input.split(',')]
-            features_input = input("Key features (comma-separated): ").strip()
+            features_input = ask("Key features (comma-separated): ")
             features = [feature.strip() for feature in features_input.split(',') if feature.strip()]
             
             app_structure = AppStructure(
@@ -159,14 +223,14 @@ def interactive_mode():
             )
     
     elif target_stage == PromptStage.PAGE_UI:
-        print("\n🎨 Page Specification")
-        page_name = input("Page name: ").strip() or "Main Page"
-        layout_type = input("Layout type (dashboard/form/list/custom): ").strip() or "custom"
+        ui.write("\n🎨 Page Specification\n")
+        page_name = ask("Page name: ", "Main Page")
+        layout_type = ask("Layout type (dashboard/form/list/custom): ", "custom")
         
-        components_input = input("Required components (comma-separated): ").strip()
+        components_input = ask("Required components (comma-separated): ")
         components = [comp.strip() for comp in components_input.split(',') if comp.strip()]
         
-        interactions_input = input("Key interactions (comma-separated): ").strip()
+        interactions_input = ask("Key interactions (comma-separated): ")
         interactions = [inter.strip() for inter in interactions_input.split(',') if inter.strip()]
         
         page_spec = PageSpec(
@@ -204,67 +268,108 @@ def interactive_mode():
     
     return task_context, project_info
 
-def batch_mode(config_file: str):
-    """Batch mode using JSON configuration file"""
+def _context_from_config(config: Dict[str, Any]) -> Tuple[TaskContext, ProjectInfo]:
+    """Build the task context and project info for one parsed configuration"""
+    # Parse tool and stage
+    tool_name = config.get('target_tool', 'lovable')
+    stage_name = config.get('stage', 'app_skeleton')
+    
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        target_tool = SupportedTool(tool_name)
+    except ValueError:
+        target_tool = SupportedTool.LOVABLE
         
-        # Parse tool and stage
-        tool_name = config.get('target_tool', 'lovable')
-        stage_name = config.get('stage', 'app_skeleton')
-        
-        try:
-            target_tool = SupportedTool(tool_name)
-        except ValueError:
-            target_tool = SupportedTool.LOVABLE
+    try:
+        target_stage = PromptStage(stage_name)
+    except ValueError:
+        target_stage = PromptStage.APP_SKELETON
+    
+    # Build the kwargs in one dict literal rather than mutating the parsed config
+    task_context = TaskContext(**{**config['task_context'], 'target_tool': target_tool, 'stage': target_stage})
+    project_info = ProjectInfo(**config['project_info'])
+    
+    return task_context, project_info
+
+def is_array_config(config_file: str) -> bool:
+    """Check whether a configuration file holds a JSON array of configurations"""
+    try:
+        with open(config_file, 'rb') as f:
+            head = f.read(64).lstrip()
+            while not head:
+                chunk = f.read(4096)
+                if not chunk:
+                    return False
+                head = chunk.lstrip()
+    except OSError:
+        return False
+    return head.startswith(b'[')
+
+def batch_mode_stream(config_file: str) -> Iterator[Optional[Tuple[TaskContext, ProjectInfo]]]:
+    """
+    Batch mode over a JSON array of configurations, yielding one at a time
+    
+    With ijson installed the array is parsed incrementally, so memory stays
+    flat however many configurations the file holds; otherwise the whole file
+    is parsed up front. Errors are reported on stderr (stdout may be carrying
+    prompts) and yield None: once per invalid entry, or once if the file
+    itself cannot be read.
+    """
+    try:
+        with open(config_file, 'rb') as f:
+            if ijson is not None:
+                configs = ijson.items(f, 'item')
+            else:
+                data = f.read()
+                configs = orjson.loads(data) if orjson is not None else json.loads(data)
             
-        try:
-            target_stage = PromptStage(stage_name)
-        except ValueError:
-            target_stage = PromptStage.APP_SKELETON
-        
-        task_context_data = config['task_context']
-        task_context_data['target_tool'] = target_tool
-        task_context_data['stage'] = target_stage
-        
-        task_context = TaskContext(**task_context_data)
-        project_info = ProjectInfo(**config['project_info'])
+            for index, config in enumerate(configs):
+                try:
+                    entry = _context_from_config(config)
+                except KeyError as e:
+                    print(f"❌ Missing required field in configuration #{index + 1}: {e}", file=sys.stderr)
+                    entry = None
+                except TypeError as e:
+                    print(f"❌ Invalid configuration #{index + 1}: {e}", file=sys.stderr)
+                    entry = None
+                yield entry
+    
+    except FileNotFoundError:
+        print(f"❌ Configuration file {config_file} not found!", file=sys.stderr)
+        yield None
+    except Exception as e:
+        print(f"❌ Error reading configuration: {e}", file=sys.stderr)
+        yield None
+
+def batch_mode(config_file: str):
+    """Batch mode using JSON configuration file"""
+    try:
+        with open(config_file, 'rb') as f:
+            data = f.read()
+        config = orjson.loads(data) if orjson is not None else json.loads(data)
         
-        return task_context, project_info
+        return _context_from_config(config)
     
     except FileNotFoundError:
-        print(f"❌ Configuration file {config_file} not found!")
+        print(f"❌ Configuration file {config_file} not found!", file=sys.stderr)
         return None, None
     except KeyError as e:
-        print(f"❌ Missing required field in configuration: {e}")
+        print(f"❌ Missing required field in configuration: {e}", file=sys.stderr)
         return None, None
     except Exception as e:
-        print(f"❌ Error reading configuration: {e}")
+        print(f"❌ Error reading configuration: {e}", file=sys.stderr)
         return None, None
 
-def generate_prompt_simple(task_context: TaskContext, project_info: ProjectInfo) -> str:
-    """Generate a prompt using simple template approach"""
-    
-    tech_stack = ', '.join(project_info.tech_stack)
-    tech_reqs = '\n'.join(f"- {req}" for req in task_context.technical_requirements)
-    ui_reqs = '\n'.join(f"- {req}" for req in task_context.ui_requirements)
-    constraints = '\n'.join(f"- {constraint}" for constraint in task_context.constraints)
-    
-    # Task-specific guidelines
-    guidelines = get_task_guidelines(task_context.task_type)
-    guidelines_text = '\n'.join(f"- {guideline}" for guideline in guidelines)
-    
-    prompt = f"""# {task_context.task_type.title()} - {project_info.name}
+# Simple prompt layout; placeholders are filled by generate_prompt_simple via format_map
+_PROMPT_TEMPLATE = """# {task_title} - {project_name}
 
 ## 🎯 Project Overview
-{project_info.description}
+{project_description}
 
-**Target Audience:** {project_info.target_audience}
+**Target Audience:** {target_audience}
 **Technology Stack:** {tech_stack}
 
 ## 📋 Task Description
-{task_context.description}
+{task_description}
 
 ## ⚙️ Technical Requirements
 {tech_reqs}
@@ -281,7 +386,7 @@ def generate_prompt_simple(task_context: TaskContext, project_info: ProjectInfo)
 ## 📦 Expected Deliverables
 
 ### Core Features
-- Fully functional {task_context.task_type.lower()}
+- Fully functional {task_type_lower}
 - Responsive design that works on all devices
 - Clean, modern UI following current design trends
 - Proper error handling and loading states
@@ -317,72 +422,54 @@ def generate_prompt_simple(task_context: TaskContext, project_info: ProjectInfo)
 
 Please implement this step by step, ensuring each component is thoroughly tested before moving to the next."""
 
-    return prompt
+def generate_prompt_simple(task_context: TaskContext, project_info: ProjectInfo) -> str:
+    """Generate a prompt using simple template approach"""
+    return _PROMPT_TEMPLATE.format_map({
+        'task_title': task_context.task_type.title(),
+        'project_name': project_info.name,
+        'project_description': project_info.description,
+        'target_audience': project_info.target_audience,
+        'tech_stack': ', '.join(project_info.tech_stack),
+        'task_description': task_context.description,
+        'tech_reqs': _bullets(task_context.technical_requirements),
+        'ui_reqs': _bullets(task_context.ui_requirements),
+        'constraints': _bullets(task_context.constraints),
+        'guidelines_text': _bullets(get_task_guidelines(task_context.task_type)),
+        'task_type_lower': task_context.task_type.lower(),
+    })
 
-def get_task_guidelines(task_type: str) -> List[str]:
+def get_task_guidelines(task_type: str) -> Tuple[str, ...]:
     """Get specific guidelines based on task type"""
-    guidelines_map = {
-        "authentication": [
-            "Use NextAuth.js for secure authentication",
-            "Implement proper session management",
-            "Add password strength validation",
-            "Include social login options",
-            "Ensure secure token handling"
-        ],
-        "dashboard": [
-            "Use responsive grid layout",
-            "Implement real-time data updates",
-            "Add interactive charts and graphs",
-            "Include filtering and search capabilities",
-            "Optimize for mobile viewing"
-        ],
-        "ecommerce": [
-            "Implement product catalog with search",
-            "Add shopping cart functionality",
-            "Include secure payment processing",
-            "Optimize for conversion rates",
-            "Mobile-first responsive design"
-        ],
-        "payment": [
-            "Use Stripe or similar secure payment processor",
-            "Implement proper error handling for failed payments",
-            "Add receipt generation and email confirmation",
-            "Ensure PCI compliance",
-            "Include subscription and recurring payment support"
-        ]
-    }
-    
     task_lower = task_type.lower()
-    for key, guidelines in guidelines_map.items():
+    for key, guidelines in _GUIDELINE_KEYS:
         if key in task_lower:
             return guidelines
     
-    # Default guidelines
-    return [
-        "Follow modern web development best practices",
-        "Ensure responsive design for all devices",
-        "Implement proper error handling",
-        "Use TypeScript for type safety",
-        "Optimize for performance and accessibility"
-    ]
+    return _DEFAULT_GUIDELINES
+
+# Section keywords validate_prompt looks for, already lowercase
+_REQUIRED_SECTIONS = ('overview', 'description', 'requirements', 'technical', 'deliverables')
 
 def validate_prompt(prompt: str) -> Dict[str, Any]:
     """Validate the generated prompt"""
     score = 0
     issues = []
     
+    # Lowercase once; the section checks previously re-lowercased the whole prompt each time
+    prompt_lower = prompt.lower()
+    length = len(prompt)
+    
     # Check required sections
-    required_sections = ['overview', 'description', 'requirements', 'technical', 'deliverables']
-    for section in required_sections:
-        if section.lower() in prompt.lower():
+    for section in _REQUIRED_SECTIONS:
+        if section in prompt_lower:
             score += 20
         else:
             issues.append(f"Missing {section} section")
     
     # Length check
-    if 500 <= len(prompt) <= 3000:
+    if 500 <= length <= 3000:
         score += 10
-    elif len(prompt) < 500:
+    elif length < 500:
         issues.append("Prompt is too short")
     else:
         issues.append("Prompt might be too long")
@@ -446,14 +533,18 @@ def save_example_config():
         }
     }
     
-    with open('example_config.json', 'w', encoding='utf-8') as f:
-        json.dump(example_config, f, indent=2)
+    if orjson is not None:
+        data = orjson.dumps(example_config, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(example_config, indent=2).encode('utf-8')
+    with open('example_config.json', 'wb') as f:
+        f.write(data)
     
     print("📄 Example configuration saved to 'example_config.json'")
     print("💡 This shows the new multi-tool, multi-stage structure")
 
-def main():
-    """Main CLI application"""
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Parse command line flags"""
     parser = argparse.ArgumentParser(
         description="Generate optimized prompts for AI development tools using Google Gemini RAG",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -464,6 +555,7 @@ Examples:
   python generate_prompt_gemini.py --example          # Save example config
   python generate_prompt_gemini.py -o prompt.md       # Save to file
   python generate_prompt_gemini.py --rag              # Use RAG retrieval
+  python generate_prompt_gemini.py -c config.json | pbcopy   # Piped: prompt only
         """
     )
     
@@ -473,78 +565,175 @@ Examples:
                        help='Output file to save the generated prompt')
     parser.add_argument('--example', action='store_true',
                        help='Save example configuration file')
-    parser.add_argument('--validate', action='store_true', default=True,
-                       help='Validate the generated prompt (default: True)')
+    # validate stays None unless given explicitly; main() then decides from the terminal
+    validation = parser.add_mutually_exclusive_group()
+    validation.add_argument('--validate', dest='validate', action='store_true', default=None,
+                       help='Validate the generated prompt (default: only when stdout is a terminal)')
+    validation.add_argument('--no-validate', dest='validate', action='store_false',
+                       help='Skip validation')
     parser.add_argument('--rag', action='store_true',
                        help='Use RAG retrieval (requires vector database)')
     
-    args = parser.parse_args()
-    
-    # Handle example config generation
-    if args.example:
-        save_example_config()
+    return parser.parse_args(argv)
+
+def write_stdout_bytes(data: bytes):
+    """Write pre-encoded output in one call, after anything already printed"""
+    sys.stdout.flush()
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        # Replaced stdout (e.g. captured in tests) without a binary layer
+        sys.stdout.write(data.decode('utf-8'))
         return
-    
-    # Get task and project info
-    if args.config:
-        print("📋 Batch Mode - Loading configuration...")
-        task_context, project_info = batch_mode(args.config)
-        if not task_context or not project_info:
-            sys.exit(1)
-    else:
-        task_context, project_info = interactive_mode()
-    
+    buffer.write(data)
+    buffer.flush()
+
+@functools.lru_cache(maxsize=None)
+def _enhanced_generator():
+    """Create the multi-tool RAG generator once, shared by every prompt in a run"""
+    from src.generators.enhanced_generator import EnhancedMultiToolGenerator
+    return EnhancedMultiToolGenerator()
+
+def _generate_and_validate(args: argparse.Namespace, task_context: TaskContext, project_info: ProjectInfo,
+                           interactive: bool, do_validate: bool) -> str:
+    """Generate one prompt (RAG or simple) and report its validation"""
     # Generate prompt
-    print("\n🎨 Generating prompt...")
+    if interactive:
+        print("\n🎨 Generating prompt...")
     
     if args.rag and os.path.exists("chroma_multi_tool_lovable"):
-        print("🔍 Using Multi-Tool RAG retrieval...")
+        if interactive:
+            print("🔍 Using Multi-Tool RAG retrieval...")
         try:
-            from src.generators.enhanced_generator import EnhancedMultiToolGenerator
-            generator = EnhancedMultiToolGenerator()
-            result = generator.generate_enhanced_prompt(task_context)
+            result = _enhanced_generator().generate_enhanced_prompt(task_context)
             prompt = result.prompt
             
             # Display additional information
-            print(f"🎯 Tool: {result.tool.value.title()}")
-            print(f"📋 Stage: {result.stage.value.replace('_', ' ').title()}")
-            print(f"📊 Confidence: {result.confidence_score:.2f}")
-            if result.sources:
-                print(f"📚 Sources: {len(result.sources)} references")
-            if result.next_suggested_stage:
-                print(f"➡️ Next Stage: {result.next_suggested_stage.value.replace('_', ' ').title()}")
+            if interactive:
+                print(f"🎯 Tool: {_TOOL_DISPLAY[result.tool]}")
+                print(f"📋 Stage: {_STAGE_DISPLAY[result.stage]}")
+                print(f"📊 Confidence: {result.confidence_score:.2f}")
+                if result.sources:
+                    print(f"📚 Sources: {len(result.sources)} references")
+                if result.next_suggested_stage:
+                    print(f"➡️ Next Stage: {_STAGE_DISPLAY[result.next_suggested_stage]}")
                 
         except ImportError as e:
-            print(f"⚠️ Multi-tool generator unavailable: {e}")
-            print("🔄 Falling back to simple generation...")
+            print(f"⚠️ Multi-tool generator unavailable: {e}", file=sys.stderr)
+            print("🔄 Falling back to simple generation...", file=sys.stderr)
             prompt = generate_prompt_simple(task_context, project_info)
     else:
         prompt = generate_prompt_simple(task_context, project_info)
     
     # Validate prompt
-    if args.validate:
+    if do_validate:
         validation = validate_prompt(prompt)
-        print(f"\n✅ Validation Score: {validation['score']}/100")
+        report = sys.stdout if interactive else sys.stderr
+        print(f"\n✅ Validation Score: {validation['score']}/100", file=report)
         if validation['issues']:
-            print("⚠️ Issues found:")
+            print("⚠️ Issues found:", file=report)
             for issue in validation['issues']:
-                print(f"  - {issue}")
+                print(f"  - {issue}", file=report)
+    
+    return prompt
+
+def _run_batch_stream(args: argparse.Namespace, interactive: bool, do_validate: bool):
+    """Generate and write prompts for an array-shaped config one entry at a time"""
+    separator = b"\n\n" + b"-" * 60 + b"\n\n"
+    count = 0
+    failed = 0
     
-    # Output prompt
+    out = open(args.output, 'wb', buffering=65536) if args.output else None
+    try:
+        for entry in batch_mode_stream(args.config):
+            if entry is None:
+                failed += 1
+                continue
+            task_context, project_info = entry
+            prompt = _generate_and_validate(args, task_context, project_info, interactive, do_validate)
+            data = prompt.encode('utf-8')
+            if count:
+                data = separator + data
+            if out is not None:
+                out.write(data)
+            else:
+                write_stdout_bytes(data + b"\n" if interactive else data)
+            count += 1
+    finally:
+        if out is not None:
+            out.close()
+    
+    if interactive and count:
+        saved = f" and saved to: {args.output}" if args.output else ""
+        print(f"\n🎉 {count} prompts generated{saved}")
+    if failed or not count:
+        if failed:
+            print(f"❌ {failed} configuration(s) could not be processed", file=sys.stderr)
+        sys.exit(1)
+
+def main():
+    """Main CLI application"""
+    args = parse_args(sys.argv[1:])
+    
+    # When piped, stdout carries only the prompt: no banners, and no validation
+    # unless explicitly requested (its report then goes to stderr)
+    interactive = sys.stdout.isatty()
+    do_validate = args.validate if args.validate is not None else interactive
+    
+    # Handle example config generation
+    if args.example:
+        save_example_config()
+        return
+    
+    # Array-shaped configs are streamed, one prompt per entry
+    if args.config and is_array_config(args.config):
+        if interactive:
+            print("📋 Batch Mode - Streaming configurations...")
+        _run_batch_stream(args, interactive, do_validate)
+        return
+    
+    # Get task and project info
+    if args.config:
+        if interactive:
+            print("📋 Batch Mode - Loading configuration...")
+        task_context, project_info = batch_mode(args.config)
+        if not task_context or not project_info:
+            sys.exit(1)
+    else:
+        task_context, project_info = interactive_mode()
+    
+    prompt = _generate_and_validate(args, task_context, project_info, interactive, do_validate)
+    
+    if not interactive:
+        if args.output:
+            with open(args.output, 'wb', buffering=65536) as f:
+                f.write(prompt.encode('utf-8'))
+        else:
+            write_stdout_bytes(prompt.encode('utf-8'))
+        return
+    
+    # Output prompt, encoded once and written with a single buffered write
+    data = prompt.encode('utf-8')
+    chunks = []
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(prompt)
-        print(f"\n💾 Prompt saved to: {args.output}")
+        with open(args.output, 'wb', buffering=65536) as f:
+            f.write(data)
+        chunks.append(f"\n💾 Prompt saved to: {args.output}\n".encode('utf-8'))
     else:
-        print("\n📄 Generated Prompt:")
-        print("=" * 60)
-        print(prompt)
+        chunks.append("\n📄 Generated Prompt:\n".encode('utf-8') + b"=" * 60 + b"\n")
+        chunks.append(data)
+        chunks.append(b"\n")
     
-    print(f"\n🎉 Prompt generated successfully! ({len(prompt)} characters)")
-    print("📋 Copy the prompt above and paste it into your chosen AI development tool")
+    footer = (
+        f"\n🎉 Prompt generated successfully! ({len(prompt)} characters)\n"
+        "📋 Copy the prompt above and paste it into your chosen AI development tool\n"
+    )
     if hasattr(task_context, 'target_tool'):
-        print(f"🛠️ Target Tool: {task_context.target_tool.value.title()}")
-        print(f"📋 Stage: {task_context.stage.value.replace('_', ' ').title()}")
+        footer += (
+            f"🛠️ Target Tool: {_TOOL_DISPLAY[task_context.target_tool]}\n"
+            f"📋 Stage: {_STAGE_DISPLAY[task_context.stage]}\n"
+        )
+    chunks.append(footer.encode('utf-8'))
+    write_stdout_bytes(b"".join(chunks))
 
 if __name__ == "__main__":
     main()
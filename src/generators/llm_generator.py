@@ -4,28 +4,16 @@ Integrates with your existing RAG system to generate actual responses
 """
 
 import os
-from typing import Dict, Any, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema import SystemMessage, HumanMessage
-from dotenv import load_dotenv
+import re
+import asyncio
+import hashlib
+import threading
+import functools
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
 
-# Load environment variables
-load_dotenv()
-
-class LLMUIGenerator:
-    """Generate actual UI/UX responses using LLM"""
-    
-    def __init__(self):
-        # Set up Gemini model
-        self.model = ChatGoogleGenerativeAI(
-            model="gemini-1.5-flash",
-            temperature=0.3,
-            google_api_key=os.environ.get('GOOGLE_API_KEY', '')
-        )
-        
-        # System message for UI/UX generation
-        self.system_prompt = """You are a top-tier senior UI/UX designer working at Lovable.dev with 10+ years of experience designing responsive, production-ready interfaces for both mobile and desktop applications.
+# System message for UI/UX generation
+_SYSTEM_PROMPT = """You are a top-tier senior UI/UX designer working at Lovable.dev with 10+ years of experience designing responsive, production-ready interfaces for both mobile and desktop applications.
 
 Your job is to convert app ideas into detailed screen-by-screen UI design plans for cross-platform apps.
 
@@ -45,67 +33,8 @@ Your expertise includes:
 
 When given an app idea, you MUST respond with a comprehensive UI/UX design plan that follows the EXACT format shown in the example. Do not deviate from the emoji structure."""
 
-    def generate_ui_response(self, prompt: str, app_details: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Generate actual UI/UX design response using LLM
-        
-        Args:
-            prompt: The formatted prompt template
-            app_details: Application details for context
-            
-        Returns:
-            Dict with generated response and metadata
-        """
-        try:
-            # Create few-shot example for better results
-            few_shot_example = self._get_few_shot_example()
-            
-            # Combine system message, few-shot example, and user prompt
-            full_prompt = f"""{self.system_prompt}
-
-## REQUIRED OUTPUT FORMAT EXAMPLE:
-
-{few_shot_example}
-
-## IMPORTANT INSTRUCTIONS:
-1. Use the EXACT emoji format shown above (🖼️, 🔍, 📐, 📱, 💻, 🔘, 🔗, ✅)
-2. Include ALL sections for each page: Purpose, Layout Structure, Mobile/Desktop adjustments, UI Elements, Page Connections, UX Notes
-3. Design AT LEAST 3-5 pages for a complete app
-4. Be specific and actionable in every section
-5. Follow the exact formatting structure
-
-## NOW GENERATE THE SAME DETAILED BREAKDOWN FOR THE FOLLOWING APP:
-
-{prompt}
-
-Remember: Use the EXACT emoji format and include all required sections!"""
-
-            # Generate response using Gemini
-            messages = [HumanMessage(content=full_prompt)]
-            response = self.model.invoke(messages)
-            
-            # Extract and format response
-            generated_content = response.content
-            
-            return {
-                'success': True,
-                'generated_ui_design': generated_content,
-                'app_details': app_details,
-                'model_used': 'gemini-1.5-flash',
-                'prompt_length': len(prompt),
-                'response_length': len(generated_content)
-            }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f"LLM Generation Error: {str(e)}",
-                'app_details': app_details
-            }
-    
-    def _get_few_shot_example(self) -> str:
-        """Provide a few-shot example for better LLM responses"""
-        return """📱 **Task Manager App Example**
+# Few-shot example showing the exact output format
+_FEW_SHOT_EXAMPLE = """📱 **Task Manager App Example**
 
 ## 📋 All Required Screens:
 1. **Login/Signup** - User authentication
@@ -196,6 +125,207 @@ Forms: Validation states, required field indicators
 - Quick category creation from this form
 - Default due date to today + 1 day"""
 
+# Everything around the user prompt is fixed, so it is built once. Identical
+# prefix bytes on every request also let the API reuse its prompt cache
+_PROMPT_PREFIX = (
+    _SYSTEM_PROMPT
+    + "\n\n## REQUIRED OUTPUT FORMAT EXAMPLE:\n\n"
+    + _FEW_SHOT_EXAMPLE
+    + """
+
+## IMPORTANT INSTRUCTIONS:
+1. Use the EXACT emoji format shown above (🖼️, 🔍, 📐, 📱, 💻, 🔘, 🔗, ✅)
+2. Include ALL sections for each page: Purpose, Layout Structure, Mobile/Desktop adjustments, UI Elements, Page Connections, UX Notes
+3. Design AT LEAST 3-5 pages for a complete app
+4. Be specific and actionable in every section
+5. Follow the exact formatting structure
+
+## NOW GENERATE THE SAME DETAILED BREAKDOWN FOR THE FOLLOWING APP:
+
+"""
+)
+_PROMPT_SUFFIX = """
+
+Remember: Use the EXACT emoji format and include all required sections!"""
+
+# Section markers as emitted in the few-shot format, found in one scan of the response
+_PAGE_MARKER = '🖼️ **Page Name**'
+_LAYOUT_MARKER = '📐 **Layout Structure**'
+_MOBILE_MARKER = '📱 **Mobile View'
+_DESKTOP_MARKER = '💻 **Desktop View'
+_UI_ELEMENTS_MARKER = '🔘 **Key UI Elements**'
+_CONNECTIONS_MARKER = '🔗 **Page Connections**'
+_UX_NOTES_MARKER = '✅ **UX Notes**'
+# Named groups map each match straight to its metric
+_SECTION_GROUPS = {
+    'has_page_sections': _PAGE_MARKER,
+    'has_layout_structure': _LAYOUT_MARKER,
+    'has_mobile_adjustments': _MOBILE_MARKER,
+    'has_desktop_adjustments': _DESKTOP_MARKER,
+    'has_ui_elements': _UI_ELEMENTS_MARKER,
+    'has_page_connections': _CONNECTIONS_MARKER,
+    'has_ux_notes': _UX_NOTES_MARKER,
+}
+_SECTION_RE = re.compile('|'.join(
+    f"(?P<{name}>{re.escape(marker)})" for name, marker in _SECTION_GROUPS.items()
+))
+
+# Exact-match cache of generated responses, keyed by a hash of the full prompt
+_LLM_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_LLM_CACHE_MAX = 256
+_LLM_CACHE_LOCK = threading.Lock()
+
+def _cache_key(full_prompt: str) -> bytes:
+    """Hash the full prompt into a compact cache key"""
+    return hashlib.blake2b(full_prompt.encode('utf-8'), digest_size=16).digest()
+
+def _cache_get(key: bytes) -> Optional[str]:
+    """Return a cached response and mark it most recently used"""
+    with _LLM_CACHE_LOCK:
+        content = _LLM_CACHE.get(key)
+        if content is not None:
+            _LLM_CACHE.move_to_end(key)
+        return content
+
+def _cache_put(key: bytes, content: str):
+    """Store a response, evicting the least recently used beyond _LLM_CACHE_MAX"""
+    with _LLM_CACHE_LOCK:
+        _LLM_CACHE[key] = content
+        _LLM_CACHE.move_to_end(key)
+        if len(_LLM_CACHE) > _LLM_CACHE_MAX:
+            _LLM_CACHE.popitem(last=False)
+
+@functools.lru_cache(maxsize=None)
+def _chat_model_class():
+    """Import the Gemini chat model and load environment variables on first use only"""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from dotenv import load_dotenv
+    
+    load_dotenv()
+    return ChatGoogleGenerativeAI
+
+class LLMUIGenerator:
+    """Generate actual UI/UX responses using LLM"""
+    
+    def __init__(self):
+        # Set up Gemini model (LangChain is imported here, not when this module loads)
+        ChatGoogleGenerativeAI = _chat_model_class()
+        self.model = ChatGoogleGenerativeAI(
+            model="gemini-1.5-flash",
+            temperature=0.3,
+            google_api_key=os.environ.get('GOOGLE_API_KEY', '')
+        )
+        
+        # System message for UI/UX generation
+        self.system_prompt = _SYSTEM_PROMPT
+
+    def generate_ui_response(self, prompt: str, app_details: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate actual UI/UX design response using LLM
+        
+        Args:
+            prompt: The formatted prompt template
+            app_details: Application details for context
+            
+        Returns:
+            Dict with generated response and metadata
+        """
+        try:
+            # Combine system message, few-shot example, and user prompt
+            full_prompt = _PROMPT_PREFIX + prompt + _PROMPT_SUFFIX
+            
+            # Identical prompts reuse the earlier response
+            key = _cache_key(full_prompt)
+            cached = _cache_get(key)
+            if cached is not None:
+                return self._success_result(prompt, app_details, cached, cache_hit=True)
+
+            # Generate response using Gemini; a plain string is sent as a single
+            # human message without building a message list first
+            response = self.model.invoke(full_prompt)
+            
+            # Extract and format response
+            _cache_put(key, response.content)
+            return self._success_result(prompt, app_details, response.content)
+            
+        except Exception as e:
+            return self._error_result(app_details, e)
+    
+    async def agenerate_many(self, prompts: List[str], app_details_list: List[Dict[str, Any]],
+                             max_concurrency: int = 4) -> List[Dict[str, Any]]:
+        """
+        Generate UI/UX design responses for several prompts concurrently
+        
+        Args:
+            prompts: Formatted prompt templates
+            app_details_list: Application details for each prompt
+            max_concurrency: Maximum requests in flight, to stay within Gemini rate limits
+            
+        Returns:
+            One result dict per prompt, in the same shape as generate_ui_response
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def invoke(prompt: str):
+            full_prompt = _PROMPT_PREFIX + prompt + _PROMPT_SUFFIX
+            key = _cache_key(full_prompt)
+            cached = _cache_get(key)
+            if cached is not None:
+                return cached, True
+            
+            async with semaphore:
+                response = await self.model.ainvoke(full_prompt)
+            _cache_put(key, response.content)
+            return response.content, False
+        
+        responses = await asyncio.gather(*(invoke(prompt) for prompt in prompts), return_exceptions=True)
+        
+        return [
+            self._error_result(app_details, response) if isinstance(response, Exception)
+            else self._success_result(prompt, app_details, *response)
+            for prompt, app_details, response in zip(prompts, app_details_list, responses)
+        ]
+    
+    def generate_ui_responses(self, prompts: List[str], app_details_list: List[Dict[str, Any]],
+                              max_concurrency: int = 4) -> List[Dict[str, Any]]:
+        """Synchronous wrapper around agenerate_many"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.agenerate_many(prompts, app_details_list, max_concurrency))
+        
+        # asyncio.run cannot start inside a running event loop (a notebook or an async
+        # server calling us), so generate one prompt at a time instead
+        return [
+            self.generate_ui_response(prompt, app_details)
+            for prompt, app_details in zip(prompts, app_details_list)
+        ]
+    
+    def _success_result(self, prompt: str, app_details: Dict[str, Any], generated_content: str,
+                        cache_hit: bool = False) -> Dict[str, Any]:
+        """Build the result dict for a generated response"""
+        return {
+            'success': True,
+            'generated_ui_design': generated_content,
+            'app_details': app_details,
+            'model_used': 'gemini-1.5-flash',
+            'prompt_length': len(prompt),
+            'response_length': len(generated_content),
+            'cache_hit': cache_hit
+        }
+    
+    def _error_result(self, app_details: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Build the result dict for a failed generation"""
+        return {
+            'success': False,
+            'error': f"LLM Generation Error: {str(error)}",
+            'app_details': app_details
+        }
+    
+    def _get_few_shot_example(self) -> str:
+        """Provide a few-shot example for better LLM responses"""
+        return _FEW_SHOT_EXAMPLE
+
     def validate_response_quality(self, response: str) -> Dict[str, Any]:
         """
         Validate the quality of the generated response
@@ -206,17 +336,17 @@ Forms: Validation states, required field indicators
         Returns:
             Quality metrics and validation results
         """
-        metrics = {
-            'has_page_sections': '🖼️ Page Name:' in response,
-            'has_layout_structure': '📐 Layout Structure:' in response,
-            'has_mobile_adjustments': '📱 Mobile View' in response,
-            'has_desktop_adjustments': '💻 Desktop View' in response,
-            'has_ui_elements': '🔘 Key UI Elements:' in response,
-            'has_page_connections': '🔗 Page Connections:' in response,
-            'has_ux_notes': '✅ UX Notes:' in response,
-            'response_length': len(response),
-            'estimated_pages': response.count('🖼️ Page Name:')
-        }
+        seen = set()
+        pages = 0
+        for match in _SECTION_RE.finditer(response):
+            group = match.lastgroup
+            seen.add(group)
+            if group == 'has_page_sections':
+                pages += 1
+        
+        metrics = {name: name in seen for name in _SECTION_GROUPS}
+        metrics['response_length'] = len(response)
+        metrics['estimated_pages'] = pages
         
         # Calculate quality score
         structure_score = sum([
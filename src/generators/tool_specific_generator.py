@@ -4,12 +4,25 @@ Supports multiple no-code/low-code tools with RAG-powered documentation retrieva
 """
 
 import os
+import re
+import asyncio
 import yaml
 import json
-from typing import Dict, List, Optional, Any, Tuple
+import hashlib
+import mmap
+import sqlite3
+import uuid
+import functools
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 import glob
+from concurrent.futures import ThreadPoolExecutor
+
+import chromadb
 
 from langchain_community.document_loaders import DirectoryLoader, TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -18,19 +31,89 @@ from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import Chroma
 from dotenv import load_dotenv
 
+from src.core.vector_backend import VectorStoreBackend, FaissBackend
+from src.core.text_splitter import SplitThenMergeSplitter
+from src.core.prompt_validation import keyword_pattern, find_keywords
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # enables HTTP/2 in httpx
+except ImportError:
+    h2 = None
+
+# Fallbacks for tools without (or missing from) a config
+DEFAULT_STAGES = ('planning', 'implementation', 'testing')
+DEFAULT_COMPONENTS = ('ui', 'logic', 'data')
+_EMPTY_MAP: Mapping[str, Any] = MappingProxyType({})
+
+# Retrieval results cached per exact (tool, query, num_docs); cleared whenever chunks are added
+SEARCH_CACHE_SIZE = 1024
+
+# Each tool's chunks live in their own collection, so searches need no metadata filter
+TOOL_COLLECTION_PREFIX = "tool_"
+
+# Chunks per embedding request / collection add; Chroma slows down on very large single adds
+ADD_BATCH_SIZE = 500
+
+# Embedding requests in flight while earlier batches are being written
+EMBED_CONCURRENCY = 4
+
+# Texts per OpenAI embeddings request (the API maximum) and retries on rate limits
+OPENAI_EMBED_CHUNK_SIZE = 2048
+OPENAI_MAX_RETRIES = 6
+
+# Small-to-big retrieval: children are embedded and searched, their parents returned.
+# Searches fetch this many children per requested parent, since siblings collapse
+PARENT_CHUNK_SIZE = 2000
+CHILD_OVERSAMPLE = 3
+PARENTS_DB_NAME = "parents.db"
+
+# Markdown files at least this large are decoded straight from a read-only memory map
+MMAP_MIN_BYTES = 256 * 1024
+
+# Maps each indexed markdown file to a hash of its content, next to the Chroma files
+MANIFEST_NAME = "manifest.json"
+
+# Filename keyword -> document type. Each alternative is a lookahead anchored at the
+# start, so the first keyword in this order wins regardless of where it appears
+_DOC_TYPE_RE = re.compile('|'.join(
+    f"(?=.*?(?P<{doc_type}>{keyword}))"
+    for keyword, doc_type in (
+        ('comprehensive', 'comprehensive_guide'),
+        ('prompt', 'system_prompt'),
+        ('tool', 'tool_config'),
+        ('guide', 'user_guide'),
+        ('pattern', 'design_patterns'),
+        ('api', 'api_docs'),
+    )
+), re.IGNORECASE | re.DOTALL)
+
+# validate_prompt keywords: section names match case-sensitively, technical words in any case
+VALIDATION_SECTIONS = ('Project', 'Task', 'Guidelines')
+TECHNICAL_WORDS = ('requirements', 'constraints', 'specifications')
+
+_VALIDATION_RE = keyword_pattern(VALIDATION_SECTIONS, TECHNICAL_WORDS)
+
+# libyaml's C loader when available (several times faster than the pure-Python one)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 load_dotenv()
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ToolConfig:
-    """Configuration for a specific tool"""
+    """Configuration for a specific tool (immutable; shared by every generator instance)"""
     name: str
     format: str
     tone: str
     framework: str
-    use_cases: List[str]
+    use_cases: Tuple[str, ...]
     strategies: Dict[str, Any]
-    stages: List[str]
-    components: List[str]
+    stages: Tuple[str, ...]
+    components: Tuple[str, ...]
 
 @dataclass
 class TaskContext:
@@ -56,188 +139,617 @@ class ProjectInfo:
     requirements: List[str]
     tool: str
 
+def _config_signature(config_dir: str) -> Tuple[Tuple[str, int], ...]:
+    """(path, mtime_ns) of every YAML config in config_dir, in name order"""
+    try:
+        # One directory scan; DirEntry caches its stat result
+        with os.scandir(config_dir) as it:
+            entries = sorted((e for e in it if e.name.endswith(".yaml") and e.is_file()), key=lambda e: e.name)
+    except FileNotFoundError:
+        return ()
+    return tuple((e.path, e.stat().st_mtime_ns) for e in entries)
+
+def _load_tools_from(config_dir: str) -> Mapping[str, ToolConfig]:
+    """Load configuration for all tools in config_dir, reparsing only after a file is added, removed or edited"""
+    return _load_tools_cached(_config_signature(config_dir))
+
+@functools.lru_cache(maxsize=8)
+def _load_tools_cached(signature: Tuple[Tuple[str, int], ...]) -> Mapping[str, ToolConfig]:
+    """Parse the tool configs listed in signature; every generator instance shares the result"""
+    tools_config = {}
+    
+    for path, _ in signature:
+        tool_name = Path(path).stem
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                config_data = yaml.load(f, Loader=_YamlLoader)
+            
+            tools_config[tool_name] = ToolConfig(
+                name=config_data.get('tool_name', tool_name),
+                format=config_data.get('format', 'structured'),
+                tone=config_data.get('tone', 'professional'),
+                framework=config_data.get('framework', 'Standard development'),
+                use_cases=tuple(config_data.get('preferred_use_cases', ())),
+                strategies=config_data.get('prompting_strategies', {}),
+                stages=tuple(config_data.get('development_stages', DEFAULT_STAGES)),
+                components=tuple(config_data.get('supported_components', DEFAULT_COMPONENTS))
+            )
+        except Exception as e:
+            print(f"Error loading config for {tool_name}: {e}")
+    
+    return MappingProxyType(tools_config)
+
+@functools.lru_cache(maxsize=None)
+def _openai_http_client():
+    """One keep-alive HTTP client for all synchronous OpenAI embedding calls (HTTP/2 when h2 is installed)"""
+    if httpx is None:
+        return None
+    return httpx.Client(
+        http2=h2 is not None,
+        timeout=60,
+        limits=httpx.Limits(max_keepalive_connections=20)
+    )
+
+class ParentStore:
+    """SQLite table of parent chunks keyed by parent_id, next to the vector store"""
+    
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Searches run on a thread pool, so share one connection behind a lock
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS parents ("
+                "parent_id TEXT PRIMARY KEY, source TEXT, content TEXT, metadata TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS parents_source ON parents (source)")
+    
+    def add(self, parents: List[Document]):
+        """Store parent chunks (each carrying parent_id and source metadata)"""
+        rows = [
+            (doc.metadata['parent_id'], doc.metadata['source'], doc.page_content, json.dumps(doc.metadata))
+            for doc in parents
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO parents VALUES (?, ?, ?, ?)", rows)
+    
+    def get(self, parent_ids: List[str]) -> Dict[str, Document]:
+        """Look up parent chunks by id; unknown ids are left out"""
+        if not parent_ids:
+            return {}
+        placeholders = ",".join("?" * len(parent_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT parent_id, content, metadata FROM parents WHERE parent_id IN ({placeholders})",
+                parent_ids
+            ).fetchall()
+        return {
+            parent_id: Document(page_content=content, metadata=json.loads(metadata))
+            for parent_id, content, metadata in rows
+        }
+    
+    def delete_sources(self, sources: List[str]):
+        """Remove every parent chunk of the given source files"""
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM parents WHERE source = ?", [(source,) for source in sources])
+    
+    def clear(self):
+        """Remove all parent chunks"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM parents")
+
 class ToolSpecificPromptGenerator:
     """Enhanced prompt generator supporting multiple tools"""
     
-    def __init__(self, chroma_path: str = "storage/chroma_multi_tool"):
+    def __init__(self, chroma_path: str = "storage/chroma_multi_tool", vector_backend: str = "chroma"):
+        """
+        Args:
+            chroma_path: Directory for the persisted vector store
+            vector_backend: "chroma" or "faiss". Either way each tool gets its own
+                collection or index; FAISS keeps memory-mapped HNSW indexes under
+                <chroma_path>/faiss, suited to large corpora
+        """
         self.chroma_path = chroma_path
-        self.embeddings = OpenAIEmbeddings()
-        self.vector_store = None
+        self.vector_backend = VectorStoreBackend(vector_backend)
+        
+        # Vector stores are opened (or built) on the first retrieval, so callers that
+        # only need tool configs never touch OpenAI or the persist directory
+        self.vector_stores: Dict[str, Any] = {}
+        self._stores_ready = False
+        self._stores_lock = threading.Lock()
+        self._chroma_client = None
+        
+        # Documents are cut into large parent chunks for prompt context, and each
+        # parent into small child chunks for embedding. Split-then-merge re-splits
+        # oversized children and folds tiny fragments into a neighbour
+        self.parent_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=PARENT_CHUNK_SIZE,
+            chunk_overlap=0,
+            separators=["\n\n", "\n", " ", ""]
+        )
+        self.text_splitter = SplitThenMergeSplitter(
+            chunk_size=400,
+            chunk_overlap=50,
+            max_chunk_size=460,
+            min_chunk_tokens=25,
+            separators=["\n\n", "\n", " ", ""]
+        )
+        
+        # Per-instance LRU of similarity searches keyed on (tool, query, num_docs). Ingestion bumps
+        # the generation, so a search that overlaps a write never stores its result
+        self._search_cache: "OrderedDict[Tuple[str, str, int], Tuple[Document, ...]]" = OrderedDict()
+        self._search_lock = threading.Lock()
+        self._search_generation = 0
+        
         self.tools_config = self._load_all_tools_config()
         self.available_tools = list(self.tools_config.keys())
         
-        # Initialize vector store
-        self._initialize_vector_store()
+        # get_tool_info results, built once since configs never change
+        self._tool_info_cache: Dict[str, Mapping[str, Any]] = {
+            tool: MappingProxyType({
+                'name': config.name,
+                'format': config.format,
+                'tone': config.tone,
+                'framework': config.framework,
+                'use_cases': config.use_cases,
+                'stages': config.stages,
+                'components': config.components
+            })
+            for tool, config in self.tools_config.items()
+        }
+    
+    @functools.cached_property
+    def embeddings(self) -> OpenAIEmbeddings:
+        """OpenAI embeddings client, created on first use"""
+        # Large requests over a shared keep-alive connection; the async path keeps
+        # its default client, since an AsyncClient is tied to one event loop
+        return OpenAIEmbeddings(
+            chunk_size=OPENAI_EMBED_CHUNK_SIZE,
+            max_retries=OPENAI_MAX_RETRIES,
+            request_timeout=60,
+            http_client=_openai_http_client()
+        )
+    
+    @functools.cached_property
+    def parent_store(self) -> ParentStore:
+        """Parent chunk table, opened on first use"""
+        return ParentStore(Path(self.chroma_path) / PARENTS_DB_NAME)
+    
+    def _ensure_vector_stores(self):
+        """Open or build the vector stores once, on the first call that needs them"""
+        if self._stores_ready:
+            return
+        with self._stores_lock:
+            if not self._stores_ready:
+                self._initialize_vector_store()
+                self._stores_ready = True
     
-    def _load_all_tools_config(self) -> Dict[str, ToolConfig]:
-        """Load configuration for all available tools"""
-        tools_config = {}
-        config_dir = Path("config/tools")
+    def _load_all_tools_config(self) -> Mapping[str, ToolConfig]:
+        """Load configuration for all available tools (shared by every instance)"""
+        return _load_tools_from(os.path.abspath("config/tools"))
+    
+    def _initialize_vector_store(self):
+        """Initialize or load the per-tool vector stores with tool-specific metadata"""
+        stored_tools = self._list_stored_tools()
+        if stored_tools:
+            # Saved FAISS indexes are memory-mapped read-only until something is added
+            for tool in stored_tools:
+                self.vector_stores[tool] = self._open_vector_store(tool)
+            self._sync_vector_store()
+        else:
+            self._create_vector_store()
+    
+    def _list_stored_tools(self) -> List[str]:
+        """List the tools that already have a persisted collection or index"""
+        if self.vector_backend is VectorStoreBackend.FAISS:
+            # Indexes saved without a JSON docstore (older pickle docstores) are rebuilt
+            return sorted(path.stem for path in self._faiss_dir.glob("*.index") if FaissBackend.is_saved(path))
         
-        for config_file in config_dir.glob("*.yaml"):
-            tool_name = config_file.stem
-            try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f)
-                
-                tools_config[tool_name] = ToolConfig(
-                    name=config_data.get('tool_name', tool_name),
-                    format=config_data.get('format', 'structured'),
-                    tone=config_data.get('tone', 'professional'),
-                    framework=config_data.get('framework', 'Standard development'),
-                    use_cases=config_data.get('preferred_use_cases', []),
-                    strategies=config_data.get('prompting_strategies', {}),
-                    stages=config_data.get('development_stages', ['planning', 'implementation', 'testing']),
-                    components=config_data.get('supported_components', ['ui', 'logic', 'data'])
-                )
-            except Exception as e:
-                print(f"Error loading config for {tool_name}: {e}")
+        if not os.path.exists(self.chroma_path):
+            return []
         
-        return tools_config
+        tools = []
+        for collection in self._get_chroma_client().list_collections():
+            name = getattr(collection, "name", collection)
+            if name.startswith(TOOL_COLLECTION_PREFIX):
+                tools.append(name[len(TOOL_COLLECTION_PREFIX):])
+        return tools
     
-    def _initialize_vector_store(self):
-        """Initialize or load the vector store with tool-specific metadata"""
-        if os.path.exists(self.chroma_path):
-            self.vector_store = Chroma(
-                persist_directory=self.chroma_path,
-                embedding_function=self.embeddings
+    @property
+    def _faiss_dir(self) -> Path:
+        """Directory holding the per-tool FAISS indexes"""
+        return Path(self.chroma_path) / "faiss"
+    
+    def _get_chroma_client(self):
+        """Get the persistent ChromaDB client shared by all tool collections"""
+        if self._chroma_client is None:
+            self._chroma_client = chromadb.PersistentClient(path=self.chroma_path)
+        return self._chroma_client
+    
+    def _open_vector_store(self, tool: str):
+        """Open (or create) a tool's persistent collection or FAISS index"""
+        if self.vector_backend is VectorStoreBackend.FAISS:
+            return FaissBackend(str(self._faiss_dir / f"{tool}.index"))
+        
+        return Chroma(
+            client=self._get_chroma_client(),
+            collection_name=f"{TOOL_COLLECTION_PREFIX}{tool}",
+            embedding_function=self.embeddings
+        )
+    
+    def _has_vector_store(self) -> bool:
+        """Whether any documents can be searched (opening the stores if needed)"""
+        self._ensure_vector_stores()
+        return bool(self.vector_stores)
+    
+    def _load_single_md(self, doc_file: Path) -> Optional[Document]:
+        """Read one tool markdown file into a Document, or None if it cannot be read"""
+        tool_name = doc_file.parent.name.replace('_docs', '')
+        try:
+            with open(doc_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+                    # Decode from the mapped pages without an intermediate bytes copy
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        content = str(mm, 'utf-8')
+                else:
+                    content = f.read().decode('utf-8')
+            
+            # Match text-mode reading, which translates \r\n and \r line endings
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            
+            # Determine document type
+            doc_type = self._determine_doc_type(doc_file.name)
+            
+            # Create document with enhanced metadata
+            return Document(
+                page_content=content,
+                metadata={
+                    'source': str(doc_file),
+                    'tool': tool_name,
+                    'doc_type': doc_type,
+                    'filename': doc_file.name,
+                    'comprehensive_prompt': 'comprehensive_system_prompt' in doc_file.name
+                }
             )
+        except Exception as e:
+            print(f"Error loading {doc_file}: {e}")
+            return None
+    
+    def _load_documents(self) -> Tuple[List[Document], int]:
+        """Load every tool's markdown documentation; returns the documents and the number of tools"""
+        # One os.scandir pass per directory; DirEntry answers is_dir/is_file without extra stats
+        with os.scandir("data") as it:
+            tool_dirs = sorted(entry.path for entry in it if entry.name.endswith("_docs") and entry.is_dir())
+        
+        paths = []
+        for tool_dir in tool_dirs:
+            with os.scandir(tool_dir) as it:
+                paths.extend(sorted(Path(entry.path) for entry in it if entry.name.endswith(".md") and entry.is_file()))
+        
+        if not paths:
+            return [], len(tool_dirs)
+        
+        # File reads release the GIL, so threads overlap the per-file open/read latency
+        with ThreadPoolExecutor(max_workers=min(32, len(paths))) as pool:
+            documents = [doc for doc in pool.map(self._load_single_md, paths) if doc is not None]
+        
+        return documents, len(tool_dirs)
+    
+    def _split_documents(self, documents: List[Document]) -> List[Document]:
+        """Split documents into parent chunks (stored) and child chunks (returned for embedding)"""
+        parents = self.parent_splitter.split_documents(documents)
+        for parent in parents:
+            parent.metadata['parent_id'] = uuid.uuid4().hex
+        self.parent_store.add(parents)
+        
+        # Children inherit the parent's metadata, including parent_id
+        return self.text_splitter.split_documents(parents)
+    
+    def _add_in_batches(self, split_docs: List[Document]):
+        """Embed chunks ADD_BATCH_SIZE at a time and add them to their tool's store"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self._add_in_batches_async(split_docs))
         else:
-            self._create_vector_store()
+            # asyncio.run cannot start inside a running event loop (a notebook or an
+            # async server calling us), so embed and write one batch at a time instead
+            self._add_in_batches_sync(split_docs)
+        
+        # Cached search results may no longer be the best matches
+        self.clear_context_cache()
+    
+    def _docs_by_tool(self, split_docs: List[Document]) -> Dict[str, List[Document]]:
+        """Group chunks by tool, opening each tool's store if it is not open yet"""
+        by_tool: Dict[str, List[Document]] = {}
+        for doc in split_docs:
+            by_tool.setdefault(doc.metadata['tool'], []).append(doc)
+        
+        for tool in by_tool:
+            if tool not in self.vector_stores:
+                self.vector_stores[tool] = self._open_vector_store(tool)
+        return by_tool
+    
+    def _tool_collection(self, tool: str):
+        """A tool's Chroma collection, for writing chunks that are already embedded"""
+        return self._get_chroma_client().get_collection(f"{TOOL_COLLECTION_PREFIX}{tool}")
+    
+    @staticmethod
+    def _write_batch(collection, docs: List[Document], embeddings: List[List[float]]):
+        """Add embedded chunks to a collection (LangChain's add_documents would embed them again)"""
+        collection.add(
+            ids=[str(uuid.uuid4()) for _ in docs],
+            embeddings=embeddings,
+            metadatas=[doc.metadata for doc in docs],
+            documents=[doc.page_content for doc in docs]
+        )
+    
+    def _add_in_batches_sync(self, split_docs: List[Document]):
+        """Embed and write chunks one batch at a time on the calling thread"""
+        for tool, docs in self._docs_by_tool(split_docs).items():
+            store = self.vector_stores[tool]
+            batches = [docs[start:start + ADD_BATCH_SIZE] for start in range(0, len(docs), ADD_BATCH_SIZE)]
+            if isinstance(store, FaissBackend):
+                embeddings = [
+                    embedding for batch in batches
+                    for embedding in self.embeddings.embed_documents([doc.page_content for doc in batch])
+                ]
+                store.add(embeddings, [doc.page_content for doc in docs], [doc.metadata for doc in docs])
+                store.save()
+            else:
+                collection = self._tool_collection(tool)
+                for batch in batches:
+                    self._write_batch(collection, batch, self.embeddings.embed_documents([doc.page_content for doc in batch]))
+    
+    async def _add_in_batches_async(self, split_docs: List[Document]):
+        """
+        Embed batches concurrently and write each Chroma batch as soon as it is embedded
+        
+        Up to EMBED_CONCURRENCY embedding requests run while finished batches are
+        written on a worker thread, so network and database time overlap. Writes
+        are serialized; FAISS indexes are still written once per tool.
+        """
+        semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+        write_lock = asyncio.Lock()
+        
+        async def embed(docs: List[Document]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents([doc.page_content for doc in docs])
+        
+        async def embed_and_write(collection, docs: List[Document]):
+            embeddings = await embed(docs)
+            async with write_lock:
+                await asyncio.to_thread(self._write_batch, collection, docs, embeddings)
+        
+        jobs = []
+        for tool, docs in self._docs_by_tool(split_docs).items():
+            store = self.vector_stores[tool]
+            batches = [docs[start:start + ADD_BATCH_SIZE] for start in range(0, len(docs), ADD_BATCH_SIZE)]
+            if isinstance(store, FaissBackend):
+                # Embed every batch, then write the index once
+                results = await asyncio.gather(*(embed(batch) for batch in batches))
+                embeddings = [embedding for batch_embeddings in results for embedding in batch_embeddings]
+                await asyncio.to_thread(
+                    store.add, embeddings, [doc.page_content for doc in docs], [doc.metadata for doc in docs]
+                )
+                await asyncio.to_thread(store.save)
+            else:
+                collection = self._tool_collection(tool)
+                jobs.extend(embed_and_write(collection, batch) for batch in batches)
+        
+        await asyncio.gather(*jobs)
+    
+    def _drop_faiss_store(self, tool: str):
+        """Delete a tool's FAISS index and docstore so it can be rebuilt"""
+        store = self.vector_stores.pop(tool, None)
+        if store is not None:
+            store.index_path.unlink(missing_ok=True)
+            store.docstore_path.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _tool_for_source(source: str) -> str:
+        """Tool name of a markdown file under data/<tool>_docs"""
+        return Path(source).parent.name.replace('_docs', '')
+    
+    @staticmethod
+    def _hash_documents(documents: List[Document]) -> Dict[str, str]:
+        """Map each document's source path to a SHA-1 of its content"""
+        return {
+            doc.metadata['source']: hashlib.sha1(doc.page_content.encode('utf-8')).hexdigest()
+            for doc in documents
+        }
+    
+    def _manifest_path(self) -> Path:
+        """Location of the source-hash manifest inside the Chroma directory"""
+        return Path(self.chroma_path) / MANIFEST_NAME
+    
+    def _read_manifest(self) -> Optional[Dict[str, str]]:
+        """Load the source-hash manifest, or None if there is none"""
+        try:
+            with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_manifest(self, file_hashes: Dict[str, str]):
+        """Save the source-hash manifest atomically"""
+        manifest_path = self._manifest_path()
+        tmp_path = manifest_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(file_hashes, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, manifest_path)
+        except OSError as e:
+            print(f"Warning: Could not write vector store manifest: {e}")
     
     def _create_vector_store(self):
         """Create vector store with tool-specific documentation"""
-        documents = []
-        data_dir = Path("data")
-        
-        # Load documents for each tool
-        for tool_dir in data_dir.glob("*_docs"):
-            tool_name = tool_dir.name.replace('_docs', '')
-            
-            # Load all markdown files in the tool directory
-            for doc_file in tool_dir.glob("*.md"):
-                try:
-                    with open(doc_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Determine document type
-                    doc_type = self._determine_doc_type(doc_file.name)
-                    
-                    # Create document with enhanced metadata
-                    doc = Document(
-                        page_content=content,
-                        metadata={
-                            'source': str(doc_file),
-                            'tool': tool_name,
-                            'doc_type': doc_type,
-                            'filename': doc_file.name,
-                            'comprehensive_prompt': 'comprehensive_system_prompt' in doc_file.name
-                        }
-                    )
-                    documents.append(doc)
-                except Exception as e:
-                    print(f"Error loading {doc_file}: {e}")
+        documents, tool_count = self._load_documents()
         
         if not documents:
             raise ValueError("No documents found for indexing")
         
-        print(f"📚 Loading {len(documents)} documents from {len(list(data_dir.glob('*_docs')))} tools")
+        print(f"📚 Loading {len(documents)} documents from {tool_count} tools")
         
-        # Split documents
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", " ", ""]
-        )
+        # Split documents, replacing any parents left from an earlier store
+        self.parent_store.clear()
+        split_docs = self._split_documents(documents)
         
-        split_docs = text_splitter.split_documents(documents)
+        # Create one vector store per tool
+        self._add_in_batches(split_docs)
+        self._write_manifest(self._hash_documents(documents))
         
-        # Create vector store
-        self.vector_store = Chroma.from_documents(
-            documents=split_docs,
-            embedding=self.embeddings,
-            persist_directory=self.chroma_path
-        )
+        print(f"✅ Created {len(self.vector_stores)} tool vector stores with {len(split_docs)} document chunks")
+    
+    def _sync_vector_store(self):
+        """
+        Re-index only the markdown files that changed since the manifest was written
+        
+        Changed files have their old chunks deleted and are re-added; deleted
+        files have their chunks removed. FAISS indexes cannot delete vectors, so
+        every tool with a changed or removed file has its index rebuilt. A store
+        without a manifest (built before manifests existed) is assumed current
+        and gets one recorded.
+        """
+        documents, _ = self._load_documents()
+        file_hashes = self._hash_documents(documents)
+        
+        manifest = self._read_manifest()
+        if manifest is None:
+            self._write_manifest(file_hashes)
+            return
+        
+        changed = [doc for doc in documents if manifest.get(doc.metadata['source']) != file_hashes[doc.metadata['source']]]
+        removed = [source for source in manifest if source not in file_hashes]
+        if not changed and not removed:
+            return
+        
+        if self.vector_backend is VectorStoreBackend.FAISS:
+            stale_tools = {doc.metadata['tool'] for doc in changed}
+            stale_tools.update(self._tool_for_source(source) for source in removed)
+            for tool in stale_tools:
+                self._drop_faiss_store(tool)
+            changed = [doc for doc in documents if doc.metadata['tool'] in stale_tools]
+        else:
+            for source in removed + [doc.metadata['source'] for doc in changed if doc.metadata['source'] in manifest]:
+                store = self.vector_stores.get(self._tool_for_source(source))
+                if store is not None:
+                    store.delete(where={"source": source})
         
-        print(f"✅ Created vector store with {len(split_docs)} document chunks")
+        self.parent_store.delete_sources(removed + [doc.metadata['source'] for doc in changed])
+        split_docs = self._split_documents(changed)
+        self._add_in_batches(split_docs)
+        self._write_manifest(file_hashes)
+        
+        print(f"🔄 Re-indexed {len(changed)} changed documents ({len(split_docs)} chunks), removed {len(removed)}")
     
     def _determine_doc_type(self, filename: str) -> str:
         """Determine document type from filename"""
-        filename_lower = filename.lower()
-        
-        if 'comprehensive' in filename_lower:
-            return 'comprehensive_guide'
-        elif 'prompt' in filename_lower:
-            return 'system_prompt'
-        elif 'tool' in filename_lower:
-            return 'tool_config'
-        elif 'guide' in filename_lower:
-            return 'user_guide'
-        elif 'pattern' in filename_lower:
-            return 'design_patterns'
-        elif 'api' in filename_lower:
-            return 'api_docs'
-        else:
-            return 'documentation'
+        match = _DOC_TYPE_RE.match(filename)
+        return match.lastgroup if match else 'documentation'
     
     def get_available_tools(self) -> List[str]:
         """Get list of available tools"""
         return self.available_tools
     
-    def get_tool_info(self, tool: str) -> Dict[str, Any]:
-        """Get information about a specific tool"""
-        if tool not in self.tools_config:
-            return {}
-        
-        config = self.tools_config[tool]
-        return {
-            'name': config.name,
-            'format': config.format,
-            'tone': config.tone,
-            'framework': config.framework,
-            'use_cases': config.use_cases,
-            'stages': config.stages,
-            'components': config.components
-        }
+    def get_tool_info(self, tool: str) -> Mapping[str, Any]:
+        """Get information about a specific tool (read-only; empty for unknown tools)"""
+        return self._tool_info_cache.get(tool, _EMPTY_MAP)
     
-    def get_tool_stages(self, tool: str) -> List[str]:
+    def get_tool_stages(self, tool: str) -> Tuple[str, ...]:
         """Get development stages for a specific tool"""
         if tool not in self.tools_config:
-            return ['planning', 'implementation', 'testing']
+            return DEFAULT_STAGES
         return self.tools_config[tool].stages
     
-    def get_tool_components(self, tool: str) -> List[str]:
+    def get_tool_components(self, tool: str) -> Tuple[str, ...]:
         """Get supported components for a specific tool"""
         if tool not in self.tools_config:
-            return ['ui', 'logic', 'data']
+            return DEFAULT_COMPONENTS
         return self.tools_config[tool].components
     
     def get_relevant_context(self, tool: str, task_type: str, description: str, 
                            stage: Optional[str] = None, num_docs: int = 5) -> List[Document]:
         """Get relevant context for tool-specific prompt generation"""
-        if not self.vector_store:
+        if not self._has_vector_store():
             return []
         
-        # Build search query
-        search_query = f"{task_type} {description}"
-        if stage:
-            search_query += f" {stage}"
-        
-        # Create filter for tool-specific documents
-        filter_dict = {"tool": tool}
+        key = (tool, self._search_query(task_type, description, stage), num_docs)
         
         try:
-            # Perform similarity search with metadata filtering
-            docs = self.vector_store.similarity_search(
-                search_query,
-                k=num_docs,
-                filter=filter_dict
-            )
-            return docs
+            docs = self._cached_search(key)
+            if docs is None:
+                generation = self._search_generation
+                docs = self._search_by_vector(tool, self.embeddings.embed_query(key[1]), num_docs)
+                self._remember_search(key, docs, generation)
+            return list(docs)
         except Exception as e:
             print(f"Error retrieving context: {e}")
             return []
     
+    @staticmethod
+    def _search_query(task_type: str, description: str, stage: Optional[str]) -> str:
+        """Build the search query; it is embedded exactly as built, so it also serves as the cache key"""
+        search_query = f"{task_type} {description}"
+        if stage:
+            search_query += f" {stage}"
+        return search_query
+    
+    def _cached_search(self, key: Tuple[str, str, int]) -> Optional[Tuple[Document, ...]]:
+        """Documents from an earlier search with exactly this (tool, query, num_docs), if any"""
+        with self._search_lock:
+            docs = self._search_cache.get(key)
+            if docs is not None:
+                self._search_cache.move_to_end(key)
+            return docs
+    
+    def _remember_search(self, key: Tuple[str, str, int], docs: Tuple[Document, ...], generation: int):
+        """Cache a search result unless the stores changed since the search started"""
+        with self._search_lock:
+            if generation != self._search_generation:
+                return
+            self._search_cache[key] = docs
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+    
+    def _search_by_vector(self, tool: str, embedding: List[float], num_docs: int) -> Tuple[Document, ...]:
+        """Similarity search over one tool's documents for an embedded query"""
+        # The tool's own store holds only its documents, so no metadata filter is needed
+        store = self.vector_stores.get(tool)
+        if store is None:
+            return ()
+        children = store.similarity_search_by_vector(embedding, k=num_docs * CHILD_OVERSAMPLE)
+        return self._parents_of(children, num_docs)
+    
+    def _parents_of(self, children: List[Document], num_docs: int) -> Tuple[Document, ...]:
+        """Swap child chunks for their parents, keeping rank order and dropping duplicates"""
+        parents = self.parent_store.get(list(dict.fromkeys(
+            child.metadata['parent_id'] for child in children if 'parent_id' in child.metadata
+        )))
+        
+        docs = []
+        seen = set()
+        for child in children:
+            parent_id = child.metadata.get('parent_id')
+            parent = parents.get(parent_id)
+            if parent is None:
+                # Chunk indexed before parent-child splitting; use it as is
+                docs.append(child)
+            elif parent_id not in seen:
+                seen.add(parent_id)
+                docs.append(parent)
+            if len(docs) == num_docs:
+                break
+        return tuple(docs)
+    
+    def clear_context_cache(self):
+        """Forget memoized search results, e.g. after the vector store changes"""
+        with self._search_lock:
+            self._search_generation += 1
+            self._search_cache.clear()
+    
     def generate_stage_prompt(self, task_context: TaskContext, 
                             project_info: ProjectInfo) -> str:
         """Generate a stage-specific prompt for the selected tool"""
@@ -257,6 +769,70 @@ class ToolSpecificPromptGenerator:
             stage=stage
         )
         
+        return self._prompt_from_docs(config, task_context, project_info, context_docs)
+    
+    def generate_stage_prompts_batch(self, task_contexts: List[TaskContext], project_info: ProjectInfo,
+                                     num_docs: int = 5) -> List[str]:
+        """
+        Generate stage-specific prompts for several tasks of one project
+        
+        All search queries are embedded with a single embed_documents call and
+        the per-tool searches then run concurrently, so B tasks cost one
+        embedding round-trip instead of B.
+        
+        Args:
+            task_contexts: Tasks to generate prompts for
+            project_info: Project the tasks belong to
+            num_docs: Documents to retrieve per task
+            
+        Returns:
+            One prompt per task context, in order
+        """
+        supported = [i for i, task_context in enumerate(task_contexts) if task_context.tool in self.tools_config]
+        context_docs: Dict[int, List[Document]] = {}
+        
+        if supported and self._has_vector_store():
+            keys = [
+                (task_contexts[i].tool,
+                 self._search_query(task_contexts[i].task_type, task_contexts[i].description, task_contexts[i].stage),
+                 num_docs)
+                for i in supported
+            ]
+            try:
+                generation = self._search_generation
+                results = {key: self._cached_search(key) for key in dict.fromkeys(keys)}
+                missing = [key for key, docs in results.items() if docs is None]
+                
+                if missing:
+                    # Embed each distinct uncached query once
+                    unique_queries = list(dict.fromkeys(query for _, query, _ in missing))
+                    embedding_for = dict(zip(unique_queries, self.embeddings.embed_documents(unique_queries)))
+                    
+                    with ThreadPoolExecutor(max_workers=min(8, len(missing))) as pool:
+                        found = pool.map(
+                            lambda key: self._search_by_vector(key[0], embedding_for[key[1]], num_docs),
+                            missing
+                        )
+                        for key, docs in zip(missing, found):
+                            results[key] = docs
+                            self._remember_search(key, docs, generation)
+                
+                context_docs = {i: list(results[key]) for i, key in zip(supported, keys)}
+            except Exception as e:
+                print(f"Error retrieving context: {e}")
+        
+        prompts = []
+        for i, task_context in enumerate(task_contexts):
+            config = self.tools_config.get(task_context.tool)
+            if config is None:
+                prompts.append(f"Tool '{task_context.tool}' not supported")
+            else:
+                prompts.append(self._prompt_from_docs(config, task_context, project_info, context_docs.get(i, [])))
+        return prompts
+    
+    def _prompt_from_docs(self, config: ToolConfig, task_context: TaskContext, project_info: ProjectInfo,
+                          context_docs: List[Document]) -> str:
+        """Build the prompt for a task from its retrieved documents"""
         # Build context from retrieved documents
         context_content = ""
         if context_docs:
@@ -298,87 +874,64 @@ class ToolSpecificPromptGenerator:
                           task_context: TaskContext, project_info: ProjectInfo,
                           context_content: str) -> str:
         """Build the final stage-specific prompt"""
+        stage_title = task_context.stage.title()
         
-        # Base prompt structure
-        prompt_parts = [
-            f"# {config.name} - {task_context.stage.title()} Stage",
-            f"\n## Project: {project_info.name}",
-            f"\n**Tool:** {config.name}",
-            f"**Stage:** {task_context.stage.title()}",
-            f"**Task Type:** {task_context.task_type}",
-            f"**Framework:** {config.framework}",
-        ]
-        
-        # Add project context
-        prompt_parts.extend([
-            f"\n## Project Context",
-            f"**Description:** {project_info.description}",
-            f"**Tech Stack:** {', '.join(project_info.tech_stack)}",
-            f"**Target Audience:** {project_info.target_audience}",
-        ])
-        
-        # Add task details
-        prompt_parts.extend([
-            f"\n## Task Details",
-            f"**Description:** {task_context.description}",
-        ])
-        
+        # Optional sections are prerendered, each with its leading line break, or left empty
+        tech_block = ""
         if task_context.technical_requirements:
-            prompt_parts.append(f"**Technical Requirements:**")
-            for req in task_context.technical_requirements:
-                prompt_parts.append(f"- {req}")
+            tech_block = "\n**Technical Requirements:**" + "".join(f"\n- {req}" for req in task_context.technical_requirements)
         
+        ui_block = ""
         if task_context.ui_requirements:
-            prompt_parts.append(f"\n**UI/UX Requirements:**")
-            for req in task_context.ui_requirements:
-                prompt_parts.append(f"- {req}")
+            ui_block = "\n\n**UI/UX Requirements:**" + "".join(f"\n- {req}" for req in task_context.ui_requirements)
         
+        constraints_block = ""
         if task_context.constraints:
-            prompt_parts.append(f"\n**Constraints:**")
-            for constraint in task_context.constraints:
-                prompt_parts.append(f"- {constraint}")
+            constraints_block = "\n\n**Constraints:**" + "".join(f"\n- {constraint}" for constraint in task_context.constraints)
         
         # Add relevant documentation context
-        if context_content:
-            prompt_parts.extend([
-                f"\n## Relevant Documentation",
-                context_content
-            ])
-        
-        # Add tool-specific guidelines
-        prompt_parts.extend([
-            f"\n## {config.name} Guidelines",
-            f"**Tone:** {config.tone}",
-            f"**Format:** {config.format}",
-        ])
+        context_block = f"\n\n## Relevant Documentation\n{context_content}" if context_content else ""
         
         # Add strategy-specific template
+        strategy_block = ""
         if strategy and 'template' in strategy:
-            template = strategy['template']
-            prompt_parts.extend([
-                f"\n## Implementation Strategy",
-                f"**Strategy:** {template}",
-            ])
+            strategy_block = f"\n\n## Implementation Strategy\n**Strategy:** {strategy['template']}"
         
         # Add stage-specific instructions
         stage_instructions = self._get_stage_instructions(task_context.stage, config.name)
+        instructions_block = ""
         if stage_instructions:
-            prompt_parts.extend([
-                f"\n## {task_context.stage.title()} Stage Instructions",
-                stage_instructions
-            ])
-        
-        # Final call to action
-        prompt_parts.extend([
-            f"\n## Action Required",
-            f"Please {task_context.task_type} for the {task_context.stage} stage of {project_info.name} using {config.name}.",
-            f"Focus on delivering high-quality, {config.tone} results that align with the {config.framework} approach."
-        ])
+            instructions_block = f"\n\n## {stage_title} Stage Instructions\n{stage_instructions}"
         
-        return "\n".join(prompt_parts)
+        return f"""# {config.name} - {stage_title} Stage
+
+## Project: {project_info.name}
+
+**Tool:** {config.name}
+**Stage:** {stage_title}
+**Task Type:** {task_context.task_type}
+**Framework:** {config.framework}
+
+## Project Context
+**Description:** {project_info.description}
+**Tech Stack:** {', '.join(project_info.tech_stack)}
+**Target Audience:** {project_info.target_audience}
+
+## Task Details
+**Description:** {task_context.description}{tech_block}{ui_block}{constraints_block}{context_block}
+
+## {config.name} Guidelines
+**Tone:** {config.tone}
+**Format:** {config.format}{strategy_block}{instructions_block}
+
+## Action Required
+Please {task_context.task_type} for the {task_context.stage} stage of {project_info.name} using {config.name}.
+Focus on delivering high-quality, {config.tone} results that align with the {config.framework} approach."""
     
-    def _get_stage_instructions(self, stage: str, tool_name: str) -> str:
-        """Get stage-specific instructions"""
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _get_stage_instructions(stage: str, tool_name: str) -> str:
+        """Get stage-specific instructions (memoized; stages and tools are few)"""
         instructions = {
             'planning': f"Focus on architecture, user stories, and technical planning for {tool_name}",
             'design': f"Create detailed UI/UX designs and component specifications for {tool_name}",
@@ -413,16 +966,17 @@ class ToolSpecificPromptGenerator:
         else:
             validation['issues'].append(f"Tool name '{tool}' not mentioned in prompt")
         
+        found = find_keywords(_VALIDATION_RE, prompt)
+        
         # Check for structure
-        required_sections = ['Project', 'Task', 'Guidelines']
-        for section in required_sections:
-            if section in prompt:
+        for section in VALIDATION_SECTIONS:
+            if section in found:
                 validation['score'] += 15
             else:
                 validation['suggestions'].append(f"Consider adding '{section}' section")
         
         # Check for technical details
-        if any(word in prompt.lower() for word in ['requirements', 'constraints', 'specifications']):
+        if any(word.lower() in TECHNICAL_WORDS for word in found):
             validation['score'] += 15
         else:
             validation['suggestions'].append("Add more technical specifications")
@@ -447,7 +1001,7 @@ class ToolSpecificPromptGenerator:
             'blog': ['article layout', 'comment system', 'content management', 'SEO optimization']
         }
         
-        suggestions = base_suggestions.copy()
+        suggestions = list(base_suggestions)
         if project_type in project_suggestions:
             suggestions.extend(project_suggestions[project_type])
         
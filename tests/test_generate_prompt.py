@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for the Lovable prompt CLI's batch mode
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+class FakeGenerator:
+    """Stand-in for LovablePromptGenerator that echoes the task description"""
+    
+    def generate_prompt(self, task_context, project_info):
+        return f"{project_info.name}: {task_context.description}"
+    
+    def validate_prompt(self, prompt):
+        return {'is_valid': True, 'score': 100, 'issues': [], 'suggestions': []}
+
+def test_batch_reports_a_bad_record_and_keeps_going(tmp_path, capsys):
+    module = pytest.importorskip("src.generators.generate_prompt")
+    batch = tmp_path / "batch.jsonl"
+    batch.write_text("\n".join([
+        json.dumps({'project': {'name': "Shop"}, 'task': {'task_type': "feature", 'description': "cart"}}),
+        "{not json",
+        "",
+        json.dumps({'project': {'name': "Blog"}, 'task': {'task_type': "page", 'description': "archive"}})
+    ]) + "\n", encoding='utf-8')
+    
+    results = list(module.generate_batch(FakeGenerator(), str(batch), validate=True))
+    
+    assert [result and result['prompt'] for result in results] == ["Shop: cart", None, "Blog: archive"]
+    assert results[2]['validation']['score'] == 100
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "line 2" in captured.err
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for chunking, the FAISS backend, parent-child retrieval and the search cache
+"""
+
+import sys
+import json
+import hashlib
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+DIM = 256
+
+def _embed(text: str):
+    """Deterministic bag-of-words embedding, so similar texts land close together"""
+    np = pytest.importorskip("numpy")
+    vector = np.zeros(DIM, dtype=np.float32)
+    for word in text.lower().split():
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % DIM] += 1.0
+    vector[0] += 1e-3  # never all zeros
+    return vector.tolist()
+
+class FakeEmbeddings:
+    """Stand-in for OpenAIEmbeddings that counts query embeddings"""
+    
+    def __init__(self):
+        self.queries = []
+    
+    def embed_query(self, text):
+        self.queries.append(text)
+        return _embed(text)
+    
+    def embed_documents(self, texts):
+        return [_embed(text) for text in texts]
+    
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+# ---- Split-then-merge boundaries ----
+
+def _splitter(**kwargs):
+    text_splitter = pytest.importorskip("src.core.text_splitter")
+    options = dict(chunk_size=200, chunk_overlap=0, max_chunk_size=240, min_chunk_tokens=10)
+    options.update(kwargs)
+    return text_splitter.SplitThenMergeSplitter(**options)
+
+def test_splitter_keeps_text_and_respects_ceiling():
+    splitter = _splitter()
+    text = "\n\n".join(
+        f"Paragraph {i}. " + " ".join(f"word{i}x{j}." for j in range(i * 7 % 60 + 1))
+        for i in range(40)
+    )
+    limit = int(splitter.max_chunk_size * 1.05)
+    
+    chunks = splitter.split_text(text)
+    
+    assert chunks
+    assert all(len(chunk) <= limit for chunk in chunks)
+    # Without overlap, chunk boundaries only move whitespace around
+    assert "".join("".join(chunks).split()) == "".join(text.split())
+
+def test_splitter_hard_cuts_an_oversized_sentence_at_chunk_size():
+    # No "" separator, so the base splitter leaves the run whole and pass 3 has to cut it
+    splitter = _splitter(separators=["\n\n", "\n", ". ", " "])
+    sentence = "x" * 1000
+    
+    chunks = splitter.split_text(sentence)
+    
+    assert "".join(chunks) == sentence
+    assert all(len(chunk) <= splitter.target_chunk_size for chunk in chunks)
+
+def test_splitter_folds_tiny_chunks_into_a_neighbour():
+    splitter = _splitter(chunk_size=70, max_chunk_size=200, min_chunk_tokens=10)
+    text = "Tiny.\n\n" + "A longer paragraph that easily clears the token floor on its own."
+    
+    chunks = splitter.split_text(text)
+    
+    assert len(chunks) == 1
+    assert chunks[0].startswith("Tiny.")
+
+# ---- FAISS backend ----
+
+def _faiss_backend(path, **kwargs):
+    pytest.importorskip("faiss")
+    vector_backend = pytest.importorskip("src.core.vector_backend")
+    return vector_backend.FaissBackend(str(path), **kwargs)
+
+def _random_vectors(count: int, seed: int = 0):
+    np = pytest.importorskip("numpy")
+    return np.random.default_rng(seed).standard_normal((count, DIM)).astype(np.float32)
+
+def test_faiss_round_trip(tmp_path):
+    index_path = tmp_path / "lovable.index"
+    texts = [f"document {i}" for i in range(50)]
+    vectors = _random_vectors(50)
+    store = _faiss_backend(index_path, quantize=False)
+    store.add(vectors, texts, [{'i': i} for i in range(50)])
+    
+    # add() only changes memory; nothing is on disk until save()
+    assert not index_path.exists()
+    store.save()
+    
+    reopened = _faiss_backend(index_path, quantize=False)
+    assert len(reopened) == 50
+    with open(reopened.docstore_path, encoding='utf-8') as f:
+        assert json.load(f)['texts'] == texts
+    
+    doc, distance = reopened.similarity_search_by_vector_with_relevance_scores(vectors[7], k=1)[0]
+    assert doc.page_content == texts[7]
+    assert doc.metadata == {'i': 7}
+    assert distance == pytest.approx(0.0, abs=1e-5)
+
+def test_faiss_add_after_reload(tmp_path):
+    index_path = tmp_path / "lovable.index"
+    store = _faiss_backend(index_path)
+    store.add(_random_vectors(20, seed=1), [f"first {i}" for i in range(20)], [{}] * 20)
+    store.save()
+    
+    # The reloaded index is memory-mapped read-only; adding reads it fully first
+    reopened = _faiss_backend(index_path)
+    reopened.add(_random_vectors(5, seed=2), [f"second {i}" for i in range(5)], [{}] * 5)
+    reopened.save()
+    
+    assert len(_faiss_backend(index_path)) == 25
+
+# ---- Parent-child retrieval and the search cache ----
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    """A FAISS-backed ToolSpecificPromptGenerator over two small markdown files"""
+    pytest.importorskip("faiss")
+    module = pytest.importorskip("src.generators.tool_specific_generator")
+    
+    docs_dir = tmp_path / "data" / "lovable_docs"
+    docs_dir.mkdir(parents=True)
+    (docs_dir / "auth_guide.md").write_text(
+        "\n\n".join(f"Authentication step {i}: configure login sessions and tokens." for i in range(30)),
+        encoding='utf-8'
+    )
+    (docs_dir / "layout_guide.md").write_text(
+        "\n\n".join(f"Layout tip {i}: responsive grid columns and spacing." for i in range(30)),
+        encoding='utf-8'
+    )
+    monkeypatch.chdir(tmp_path)
+    
+    gen = module.ToolSpecificPromptGenerator(chroma_path=str(tmp_path / "store"), vector_backend="faiss")
+    gen.embeddings = FakeEmbeddings()
+    return gen
+
+def test_children_resolve_to_their_parent_chunks(generator):
+    docs = generator.get_relevant_context("lovable", "configure", "login sessions tokens", num_docs=2)
+    
+    assert docs
+    top = docs[0]
+    assert top.metadata['filename'] == "auth_guide.md"
+    # Parents are the large chunks, not the small embedded children
+    assert len(top.page_content) > generator.text_splitter.max_chunk_size
+    assert generator.parent_store.get([top.metadata['parent_id']])[top.metadata['parent_id']].page_content == top.page_content
+    # Several children of one parent collapse into a single result
+    assert len({doc.metadata['parent_id'] for doc in docs}) == len(docs)
+
+def test_search_cache_is_exact_and_cleared_on_ingest(generator):
+    generator.get_relevant_context("lovable", "configure", "login")
+    generator.get_relevant_context("lovable", "configure", "login")
+    assert generator.embeddings.queries == ["configure login"]
+    
+    # A different spelling is a different query
+    generator.get_relevant_context("lovable", "Configure", "login")
+    assert generator.embeddings.queries == ["configure login", "Configure login"]
+    
+    # Adding documents invalidates cached results
+    module = sys.modules["src.generators.tool_specific_generator"]
+    new_doc = module.Document(page_content="Login screens need rate limiting.", metadata={'tool': "lovable"})
+    generator._add_in_batches(generator.text_splitter.split_documents([new_doc]))
+    generator.get_relevant_context("lovable", "configure", "login")
+    assert generator.embeddings.queries == ["configure login", "Configure login", "configure login"]
+
+# ---- Gemini prompt cache ----
+
+class FlakyEmbeddings(FakeEmbeddings):
+    """FakeEmbeddings whose first query embeddings fail, like a briefly unavailable service"""
+    
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+    
+    def embed_query(self, text):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("embedding service unavailable")
+        return super().embed_query(text)
+
+def test_prompt_built_after_failed_retrieval_is_not_cached(tmp_path, monkeypatch):
+    pytest.importorskip("faiss")
+    module = pytest.importorskip("src.generators.gemini_tool_generator")
+    from types import SimpleNamespace
+    
+    embeddings = FlakyEmbeddings(failures=1)
+    manager = SimpleNamespace(
+        get_embedding_model=lambda: embeddings,
+        embedding_config=SimpleNamespace(batch_size=16, model_name="fake")
+    )
+    monkeypatch.setattr(module, "create_embedding_manager", lambda **kwargs: manager)
+    monkeypatch.chdir(tmp_path)
+    
+    gen = module.GeminiToolSpecificPromptGenerator(chroma_path=str(tmp_path / "store"), vector_backend="faiss")
+    store = _faiss_backend(tmp_path / "lovable.index", quantize=False)
+    doc = "Use Supabase auth for login and session handling."
+    store.add([_embed(doc)], [doc], [{'tool': "lovable"}])
+    gen.vector_stores["lovable"] = store
+    
+    project = module.ProjectInfo("Shop", "An online shop", ("React",), "buyers", ("login",), "lovable")
+    task = module.TaskContext("feature", "Shop", "login with Supabase auth", "lovable", "implementation",
+                              ("auth",), ("login form",), ())
+    
+    degraded = gen.generate_prompt(project, task)
+    recovered = gen.generate_prompt(project, task)
+    
+    assert doc not in degraded
+    assert doc in recovered